@@ -4,9 +4,18 @@ Uses Playwright to fill and submit job applications.
 """
 
 import asyncio
-from typing import Dict, Optional, List, Any
-from playwright.async_api import async_playwright, Page, Browser
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, List, Any, Literal
+from urllib.parse import urlparse
+from playwright.async_api import Page, BrowserContext
+from browser import LAUNCH_ARGS, get_browser, get_playwright, shutdown_playwright
 from database import get_db
+from event_loop import install_uvloop
+from skills import get_skill
 import logging
 import sys
 
@@ -17,56 +26,259 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Attribute substrings per field type, checked in this order (first match wins)
+FIELD_PATTERNS = {
+    'linkedin': ('linkedin',),
+    'github': ('github',),
+    'website': ('website', 'portfolio'),
+    'email': ('email',),
+    'phone': ('phone',),
+    'name': ('full-name', 'fullname', 'first-name', 'last-name', 'name'),
+    'cover_letter': ('cover', 'letter'),
+}
+# JSON-ready copy passed to page.evaluate unchanged on every call
+_PATTERN_PAYLOAD = {field_type: list(patterns) for field_type, patterns in FIELD_PATTERNS.items()}
 
-class ApplicationAutomation:
-    """Browser automation for job applications."""
+# Detected fields keyed by URL host + path, most recently used last; entries expire after
+# DETECTION_CACHE_TTL seconds since the nth-of-type selectors go stale when an ATS changes its DOM
+DETECTION_CACHE_SIZE = 256
+DETECTION_CACHE_TTL = 3600.0
+_detection_cache: OrderedDict = OrderedDict()
+
+
+def _detection_key(url: str) -> str:
+    """Detection cache key: the form URL's host + path."""
+    parsed = urlparse(url)
+    return f"{parsed.netloc}{parsed.path}"
+
+# Runs inside the page: walks every input/textarea once, buckets each by its
+# type/name/id/placeholder and returns {field_type: [{selector, name, id, placeholder}, ...]}
+DETECT_FIELDS_JS = """
+(patterns) => {
+    const cssPath = (el) => {
+        const tag = el.tagName.toLowerCase();
+        if (el.id) return `#${CSS.escape(el.id)}`;
+        if (el.name) {
+            const byName = `${tag}[name="${CSS.escape(el.name)}"]`;
+            if (document.querySelectorAll(byName).length === 1) return byName;
+        }
+        const parts = [];
+        for (let node = el; node && node !== document.body; node = node.parentElement) {
+            let index = 1;
+            for (let sib = node.previousElementSibling; sib; sib = sib.previousElementSibling) {
+                if (sib.tagName === node.tagName) index++;
+            }
+            parts.unshift(`${node.tagName.toLowerCase()}:nth-of-type(${index})`);
+        }
+        return 'body > ' + parts.join(' > ');
+    };
+    const mentions = (text, list) => list.some(p => text.includes(p));
+    const skipTypes = ['hidden', 'submit', 'button', 'reset', 'checkbox', 'radio', 'file', 'image'];
+
+    const result = {other_text: []};
+    for (const fieldType of Object.keys(patterns)) result[fieldType] = [];
+    const otherTextareas = [];
+
+    for (const el of document.querySelectorAll('input, textarea')) {
+        const type = (el.getAttribute('type') || 'text').toLowerCase();
+        if (el.tagName === 'INPUT' && skipTypes.includes(type)) continue;
+        const attrs = [el.name, el.id, el.getAttribute('placeholder')].join(' ').toLowerCase();
+        const match = {
+            selector: cssPath(el),
+            name: el.getAttribute('name'),
+            id: el.id,
+            placeholder: el.getAttribute('placeholder')
+        };
+
+        if (el.tagName === 'TEXTAREA') {
+            // Cover-letter-looking textareas first, any other textarea as fallback
+            (mentions(attrs, patterns.cover_letter) ? result.cover_letter : otherTextareas).push(match);
+            continue;
+        }
+
+        let fieldType = type === 'email' ? 'email' : type === 'tel' ? 'phone' : null;
+        if (!fieldType) {
+            fieldType = Object.keys(patterns).find(
+                key => key !== 'cover_letter' && mentions(attrs, patterns[key])
+            ) || 'other_text';
+        }
+        result[fieldType].push(match);
+    }
+    result.cover_letter.push(...otherTextareas);
+    return result;
+}
+"""
+
+# Sets values through the native setter so React-controlled inputs notice the
+# change, then fires input/change events and reports whether each value stuck
+BULK_FILL_JS = """
+(actions) => actions.map(action => {
+    const el = document.querySelector(action.selector);
+    if (!el) return {ok: false};
+    const descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(el, action.value);
+    } else {
+        el.value = action.value;
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return {ok: el.value === action.value};
+})
+"""
+
+# Submit buttons: attribute selectors probed in one query, then a button-text fallback
+SUBMIT_BUTTON_CSS = 'button[type="submit"], input[type="submit"], button[name*="submit"]'
+SUBMIT_BUTTON_TEXT_RE = re.compile(r'submit|apply', re.IGNORECASE)
+# How long to wait for the submission request (a form POST or an XHR/fetch) to be answered, and
+# then for the confirmation page to settle, before the pooled page is reset to about:blank
+SUBMIT_RESPONSE_TIMEOUT_MS = 15000
+SUBMIT_SETTLE_TIMEOUT_MS = 5000
+
+# Asset types that form detection and filling never need
+BLOCKED_RESOURCE_TYPES = frozenset({'font', 'image', 'media', 'stylesheet', 'beacon', 'websocket'})
+
+
+async def _block_heavy_resources(route):
+    """Abort requests for assets that do not affect form fields."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """Long-lived browser context with a bounded pool of reusable pages."""
+    
+    def __init__(self, max_pages: int = 4, user_data_dir: Optional[str] = None,
+                 block_resources: bool = True, headless: bool = True):
+        """
+        Initialize pool settings; the browser is launched on first use.
+        Pass headless=False to watch fills, e.g. when reviewing dry runs.
+        """
+        self.max_pages = max_pages
+        self.user_data_dir = user_data_dir
+        self.block_resources = block_resources
+        self.headless = headless
+        self.context: Optional[BrowserContext] = None
+        # Held for a whole borrow, so a discarded page frees its slot for the next waiter
+        self._page_slots = asyncio.Semaphore(max_pages)
+        self._idle_pages: List[Page] = []
+        self._start_lock = asyncio.Lock()
     
-    def __init__(self, dry_run: bool = True):
-        """Initialize with dry run mode (default: True)."""
-        self.dry_run = dry_run
-        self.browser: Optional[Browser] = None
-        self.context = None
-        
     async def initialize(self):
-        """Start browser session."""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=False)  # Visible for review
-        self.context = await self.browser.new_context()
-        
-    async def close(self):
-        """Close browser session."""
+        """Start browser session if not already running."""
+        async with self._start_lock:
+            if self.context:
+                return
+            if self.user_data_dir:
+                # Persistent profile keeps ATS session cookies across runs
+                playwright = await get_playwright()
+                self.context = await playwright.chromium.launch_persistent_context(
+                    self.user_data_dir, headless=self.headless, args=LAUNCH_ARGS
+                )
+            else:
+                # Shared process-wide browser; only the context belongs to the pool
+                browser = await get_browser(headless=self.headless)
+                self.context = await browser.new_context()
+            if self.block_resources:
+                await self.context.route("**/*", _block_heavy_resources)
+    
+    @asynccontextmanager
+    async def acquire_page(self):
+        """Borrow a page from the pool, reusing an idle one or opening one if none is idle."""
+        await self.initialize()
+        wait_start = time.monotonic()
+        async with self._page_slots:
+            logger.debug(f"Waited {time.monotonic() - wait_start:.2f}s for a pooled page")
+            page = self._idle_pages.pop() if self._idle_pages else await self.context.new_page()
+            try:
+                yield page
+            finally:
+                await self._release_page(page)
+    
+    async def _release_page(self, page: Page):
+        """Reset a page and return it to the pool, dropping broken pages."""
+        try:
+            await page.goto('about:blank')
+            self._idle_pages.append(page)
+        except Exception as e:
+            logger.warning(f"Discarding pooled page: {e}")
+            if not page.is_closed():
+                await page.close()
+    
+    async def shutdown(self):
+        """Close the pool's browser context and release all pages."""
         if self.context:
             await self.context.close()
-        if self.browser:
-            await self.browser.close()
+        self.context = None
+        self._idle_pages = []
+
+
+class ApplicationAutomation:
+    """Browser automation for job applications."""
+    
+    def __init__(self, dry_run: bool = True, pool: Optional[BrowserPool] = None,
+                 screenshot_mode: Literal['none', 'viewport', 'full'] = 'viewport',
+                 require_manual_confirm: bool = True, confirm_timeout: float = 600.0):
+        """Initialize with dry run mode (default: True) and shared browser pool."""
+        self.dry_run = dry_run
+        self.pool = pool or get_browser_pool()
+        # 'viewport' = JPEG of the visible area, 'full' = full-page PNG, 'none' = skip
+        self.screenshot_mode = screenshot_mode
+        # Hold each single live submission until confirm_submission(job_id) is called;
+        # batches (apply_to_jobs) submit without waiting
+        self.require_manual_confirm = require_manual_confirm
+        self.confirm_timeout = confirm_timeout
     
     async def fill_form_field(self, page: Page, field_selector: str, value: str) -> bool:
         """
-        Fill a form field with retry logic and validation.
+        Fill a form field once and verify its value.
+        Used as the fallback for fields the bulk fill could not set.
         Returns: True if successful, False otherwise
         """
+        field = page.locator(field_selector).first
         try:
-            # Wait for field to be visible
-            await page.wait_for_selector(field_selector, state='visible', timeout=5000)
-            
-            # Clear existing content
-            await page.fill(field_selector, '')
-            
-            # Fill with new value
-            await page.fill(field_selector, value)
+            # fill() waits for the field to be editable and clears it itself
+            await field.fill(value, timeout=5000)
             
             # Verify the value was set
-            filled_value = await page.input_value(field_selector)
-            if filled_value == value:
+            if await field.input_value(timeout=5000) == value:
                 logger.info(f"✓ Filled field: {field_selector}")
                 return True
-            else:
-                logger.warning(f"✗ Field value mismatch for {field_selector}")
-                return False
-                
+            logger.warning(f"✗ Field value mismatch for {field_selector}")
         except Exception as e:
             logger.warning(f"✗ Could not fill field {field_selector}: {e}")
-            return False
+        return False
+    
+    async def bulk_fill_fields(self, page: Page, actions: List[Dict[str, str]]) -> Dict[str, bool]:
+        """
+        Fill several form fields in a single page.evaluate call.
+        Fields the bulk path cannot set fall back to fill_form_field.
+        Returns: mapping of field name to success flag
+        """
+        try:
+            outcomes = await page.evaluate(BULK_FILL_JS, actions)
+        except Exception as e:
+            logger.warning(f"Bulk fill failed, filling fields one by one: {e}")
+            outcomes = [{'ok': False}] * len(actions)
+        
+        filled = {}
+        retries = []
+        for action, outcome in zip(actions, outcomes):
+            if outcome.get('ok'):
+                logger.info(f"✓ Filled field: {action['selector']}")
+                filled[action['field']] = True
+            else:
+                retries.append(action)
+        
+        # Fallback fills target different fields, so run them concurrently
+        retry_results = await asyncio.gather(*(
+            self.fill_form_field(page, action['selector'], action['value']) for action in retries
+        ))
+        for action, success in zip(retries, retry_results):
+            filled[action['field']] = success
+        return filled
     
     async def detect_form_fields(self, page: Page) -> Dict[str, List[str]]:
         """
@@ -84,62 +296,130 @@ class ApplicationAutomation:
             'other_text': []
         }
         
-        # Name fields
-        name_patterns = ['name', 'full-name', 'fullname', 'first-name', 'last-name']
-        for pattern in name_patterns:
-            selectors = [
-                f'input[name*="{pattern}"]',
-                f'input[id*="{pattern}"]',
-                f'input[placeholder*="{pattern}"]'
-            ]
-            for sel in selectors:
-                if await page.query_selector(sel):
-                    detected['name'].append(sel)
+        # Same ATS form at the same URL yields the same fields
+        cache_key = _detection_key(page.url)
+        cached = _detection_cache.get(cache_key)
+        if cached is not None:
+            expires_at, fields = cached
+            if time.monotonic() < expires_at:
+                _detection_cache.move_to_end(cache_key)
+                return {k: list(v) for k, v in fields.items()}
+            del _detection_cache[cache_key]
+        
+        # Classify every field in a single DOM sweep and browser round-trip
+        matches = await page.evaluate(DETECT_FIELDS_JS, _PATTERN_PAYLOAD)
+        for field_type, found in matches.items():
+            detected[field_type] = [match['selector'] for match in found]
         
-        # Email fields
-        email_selectors = ['input[type="email"]', 'input[name*="email"]', 'input[id*="email"]']
-        for sel in email_selectors:
-            if await page.query_selector(sel):
-                detected['email'].append(sel)
+        # An empty or text-only result usually means the form had not rendered yet; detect again next time
+        if any(selectors for field_type, selectors in detected.items() if field_type != 'other_text'):
+            _detection_cache[cache_key] = (
+                time.monotonic() + DETECTION_CACHE_TTL,
+                {k: list(v) for k, v in detected.items()}
+            )
+            if len(_detection_cache) > DETECTION_CACHE_SIZE:
+                _detection_cache.popitem(last=False)
         
-        # Phone fields
-        phone_selectors = ['input[type="tel"]', 'input[name*="phone"]', 'input[id*="phone"]']
-        for sel in phone_selectors:
-            if await page.query_selector(sel):
-                detected['phone'].append(sel)
+        return detected
+
+    async def take_screenshot(self, page: Page, job_id: int) -> Optional[str]:
+        """
+        Capture the filled form according to screenshot_mode.
+        Returns: screenshot path, or None when screenshots are disabled
+        """
+        if self.screenshot_mode == 'none':
+            return None
+        
+        os.makedirs('./backend/logs', exist_ok=True)
+        if self.screenshot_mode == 'full':
+            screenshot_path = f"./backend/logs/application_{job_id}.png"
+            await page.screenshot(path=screenshot_path, full_page=True)
+        else:
+            screenshot_path = f"./backend/logs/application_{job_id}.jpg"
+            await page.screenshot(path=screenshot_path, type='jpeg', quality=70)
+        logger.info(f"Screenshot saved: {screenshot_path}")
+        return screenshot_path
+    
+    async def wait_for_confirmation(self, job_id: int) -> bool:
+        """
+        Park a filled application until an operator confirms it.
+        Only this task waits; other applications keep running.
+        Returns: True if confirmed within confirm_timeout
+        """
+        event = _pending_confirmations.setdefault(job_id, asyncio.Event())
+        logger.info(f"⏳ Waiting for manual confirmation of job {job_id} before submission...")
+        try:
+            await asyncio.wait_for(event.wait(), self.confirm_timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"No confirmation for job {job_id} after {self.confirm_timeout:g}s")
+            return False
+        finally:
+            _pending_confirmations.pop(job_id, None)
+    
+    async def click_submit(self, page: Page, submit_button) -> Optional[int]:
+        """
+        Click submit and wait for the submission request to be answered, so releasing
+        the page (which navigates it to about:blank) cannot abort it in flight.
+        Returns: HTTP status of the submission response, or None if none arrived in time
+        """
+        def is_submission(response) -> bool:
+            request = response.request
+            return request.method != 'GET' and request.resource_type in ('document', 'xhr', 'fetch')
         
-        # LinkedIn
-        linkedin_selectors = ['input[name*="linkedin"]', 'input[id*="linkedin"]']
-        for sel in linkedin_selectors:
-            if await page.query_selector(sel):
-                detected['linkedin'].append(sel)
+        try:
+            async with page.expect_response(is_submission, timeout=SUBMIT_RESPONSE_TIMEOUT_MS) as response_info:
+                await submit_button.click()
+            response = await response_info.value
+        except Exception as e:
+            logger.warning(f"No submission response after clicking submit: {e}")
+            return None
         
-        # Website/Portfolio
-        website_selectors = ['input[name*="website"]', 'input[name*="portfolio"]', 'input[id*="website"]']
-        for sel in website_selectors:
-            if await page.query_selector(sel):
-                detected['website'].append(sel)
+        # Let the confirmation page (or follow-up requests) finish before the page is reset
+        try:
+            await page.wait_for_load_state('networkidle', timeout=SUBMIT_SETTLE_TIMEOUT_MS)
+        except Exception:
+            logger.info(f"Post-submit page still busy after {SUBMIT_SETTLE_TIMEOUT_MS // 1000}s")
+        return response.status
+    
+    async def apply_with_skill(self, job: Dict, profile: Dict,
+                               draft: Optional[Dict]) -> Optional[Dict]:
+        """
+        Try to apply through a known ATS HTTP API instead of the browser.
+        Returns: result fields, or None to fall back to browser automation
+        """
+        host = urlparse(job['url']).netloc.lower()
+        skill = get_skill(host)
+        if not skill:
+            return None
         
-        # GitHub
-        github_selectors = ['input[name*="github"]', 'input[id*="github"]']
-        for sel in github_selectors:
-            if await page.query_selector(sel):
-                detected['github'].append(sel)
+        db = get_db()
+        if not db.is_skill_enabled(host):
+            logger.info(f"Skill for {host} disabled due to low success rate")
+            return None
         
-        # Cover letter / text areas
-        textarea_selectors = ['textarea[name*="cover"]', 'textarea[name*="letter"]', 'textarea']
-        for sel in textarea_selectors:
-            if await page.query_selector(sel):
-                detected['cover_letter'].append(sel)
+        try:
+            outcome = await skill(job, profile, draft, dry_run=self.dry_run)
+        except Exception as e:
+            logger.warning(f"Skill for {host} failed, falling back to browser: {e}")
+            if not self.dry_run:
+                db.record_skill_result(host, False)
+            return None
         
-        return detected
-
+        if outcome and not self.dry_run:
+            db.record_skill_result(host, outcome['status'] == 'submitted')
+        return outcome
+    
     async def apply_to_job(self, job_id: int, profile_id: int = 1, 
-                          draft_id: Optional[int] = None) -> Dict:
+                          draft_id: Optional[int] = None,
+                          require_confirm: Optional[bool] = None) -> Dict:
         """
         Enhanced job application automation with intelligent field mapping.
+        require_confirm overrides require_manual_confirm for this job.
         Returns: application result with detailed field mapping info
         """
+        if require_confirm is None:
+            require_confirm = self.require_manual_confirm
         db = get_db()
         
         # Get job, profile, and draft
@@ -159,141 +439,12 @@ class ApplicationAutomation:
             'fields_detected': {}
         }
         
-        try:
-            await self.initialize()
-            page = await self.context.new_page()
-            
-            # Navigate to application URL
-            logger.info(f"Navigating to: {job['url']}")
-            await page.goto(job['url'], wait_until='domcontentloaded', timeout=30000)
-            await page.wait_for_timeout(3000)
-            
-            # Detect available form fields
-            detected_fields = await self.detect_form_fields(page)
-            result['fields_detected'] = {k: len(v) for k, v in detected_fields.items() if v}
-            
-            logger.info(f"Detected fields: {result['fields_detected']}")
-            
-            # Fill name fields
-            if detected_fields['name'] and profile.get('name'):
-                for selector in detected_fields['name'][:1]:  # Fill first name field
-                    if not self.dry_run:
-                        success = await self.fill_form_field(page, selector, profile['name'])
-                        result['fields_filled']['name'] = success
-                    else:
-                        logger.info(f"[DRY RUN] Would fill name: {selector} = {profile['name']}")
-                        result['fields_filled']['name'] = 'dry_run'
-            
-            # Fill email fields
-            if detected_fields['email'] and profile.get('email'):
-                for selector in detected_fields['email'][:1]:
-                    if not self.dry_run:
-                        success = await self.fill_form_field(page, selector, profile['email'])
-                        result['fields_filled']['email'] = success
-                    else:
-                        logger.info(f"[DRY RUN] Would fill email: {selector} = {profile['email']}")
-                        result['fields_filled']['email'] = 'dry_run'
-            
-            # Fill phone fields
-            if detected_fields['phone'] and profile.get('phone'):
-                for selector in detected_fields['phone'][:1]:
-                    if not self.dry_run:
-                        success = await self.fill_form_field(page, selector, profile['phone'])
-                        result['fields_filled']['phone'] = success
-                    else:
-                        logger.info(f"[DRY RUN] Would fill phone: {selector} = {profile['phone']}")
-                        result['fields_filled']['phone'] = 'dry_run'
-            
-            # Fill links (LinkedIn, GitHub, Website)
-            if profile.get('links'):
-                links_list = [link.strip() for link in profile['links'].split(',')]
-                linkedin_url = next((link for link in links_list if 'linkedin.com' in link.lower()), None)
-                github_url = next((link for link in links_list if 'github.com' in link.lower()), None)
-                website_url = next((link for link in links_list if 'linkedin' not in link.lower() and 'github' not in link.lower()), None)
-                
-                # LinkedIn
-                if detected_fields['linkedin'] and linkedin_url:
-                    for selector in detected_fields['linkedin'][:1]:
-                        if not self.dry_run:
-                            success = await self.fill_form_field(page, selector, linkedin_url)
-                            result['fields_filled']['linkedin'] = success
-                        else:
-                            logger.info(f"[DRY RUN] Would fill LinkedIn: {selector} = {linkedin_url}")
-                            result['fields_filled']['linkedin'] = 'dry_run'
-                
-                # GitHub
-                if detected_fields['github'] and github_url:
-                    for selector in detected_fields['github'][:1]:
-                        if not self.dry_run:
-                            success = await self.fill_form_field(page, selector, github_url)
-                            result['fields_filled']['github'] = success
-                        else:
-                            logger.info(f"[DRY RUN] Would fill GitHub: {selector} = {github_url}")
-                            result['fields_filled']['github'] = 'dry_run'
-                
-                # Website/Portfolio
-                if detected_fields['website'] and website_url:
-                    for selector in detected_fields['website'][:1]:
-                        if not self.dry_run:
-                            success = await self.fill_form_field(page, selector, website_url)
-                            result['fields_filled']['website'] = success
-                        else:
-                            logger.info(f"[DRY RUN] Would fill website: {selector} = {website_url}")
-                            result['fields_filled']['website'] = 'dry_run'
-            
-            # Fill cover letter
-            if detected_fields['cover_letter'] and draft and draft.get('cover_letter'):
-                for selector in detected_fields['cover_letter'][:1]:  # Fill first textarea
-                    if not self.dry_run:
-                        success = await self.fill_form_field(page, selector, draft['cover_letter'])
-                        result['fields_filled']['cover_letter'] = success
-                    else:
-                        logger.info(f"[DRY RUN] Would fill cover letter: {selector} = [draft content]")
-                        result['fields_filled']['cover_letter'] = 'dry_run'
-            
-            # Take screenshot for review
-            import os
-            os.makedirs('./backend/logs', exist_ok=True)
-            screenshot_path = f"./backend/logs/application_{job_id}.png"
-            await page.screenshot(path=screenshot_path, full_page=True)
-            logger.info(f"Screenshot saved: {screenshot_path}")
-            result['screenshot'] = screenshot_path
-            
-            if self.dry_run:
-                result['status'] = 'dry_run_complete'
-                result['message'] = f"Dry run completed. Detected {sum(result['fields_detected'].values())} form fields. Screenshot saved."
-                logger.info("✓ DRY RUN: Form mapping completed successfully")
-            else:
-                # In real mode, look for submit button
-                submit_selectors = [
-                    'button[type="submit"]',
-                    'input[type="submit"]',
-                    'button:has-text("Submit")',
-                    'button:has-text("Apply")',
-                    'button[name*="submit"]'
-                ]
-                
-                submitted = False
-                for selector in submit_selectors:
-                    if await page.query_selector(selector):
-                        logger.info(f"Found submit button: {selector}")
-                        logger.info("⏳ Waiting 10 seconds for manual review before submission...")
-                        await page.wait_for_timeout(10000)
-                        
-                        await page.click(selector)
-                        await page.wait_for_timeout(3000)
-                        submitted = True
-                        break
-                
-                if submitted:
-                    result['status'] = 'submitted'
-                    result['message'] = 'Application submitted successfully'
-                else:
-                    result['status'] = 'manual_required'
-                    result['message'] = 'Could not find submit button. Manual submission required.'
-            
-            # Log application
-            db.log_application(
+        # Known ATS hosts accept applications over plain HTTP, no browser needed
+        skill_result = await self.apply_with_skill(job, profile, draft)
+        if skill_result:
+            result.update(skill_result)
+            logger.info(f"Applied via HTTP skill: {result['message']}")
+            db.enqueue_log(
                 job_id=job_id,
                 profile_id=profile_id,
                 job_url=job['url'],
@@ -303,17 +454,123 @@ class ApplicationAutomation:
                 draft_id=draft['id'] if draft else None,
                 draft_content=draft['cover_letter'] if draft else None
             )
-            
-            await page.close()
-            await self.close()
-            
+            return result
+        
+        try:
+            async with self.pool.acquire_page() as page:
+                # Navigate to application URL
+                logger.info(f"Navigating to: {job['url']}")
+                await page.goto(job['url'], wait_until='domcontentloaded', timeout=30000)
+                # Detection only needs the form controls, not a quiet network
+                try:
+                    await page.wait_for_selector('input, textarea', state='attached', timeout=5000)
+                except Exception:
+                    logger.info("No form fields after 5s, continuing with detection")
+                
+                # Detect available form fields
+                detected_fields = await self.detect_form_fields(page)
+                result['fields_detected'] = {k: len(v) for k, v in detected_fields.items() if v}
+                
+                logger.info(f"Detected fields: {result['fields_detected']}")
+                
+                # (field type, log label, value) for every field we know how to fill
+                links = profile.get('links') or {}
+                fill_plan = [
+                    ('name', 'name', profile.get('name')),
+                    ('email', 'email', profile.get('email')),
+                    ('phone', 'phone', profile.get('phone')),
+                    ('linkedin', 'LinkedIn', links.get('linkedin')),
+                    ('github', 'GitHub', links.get('github')),
+                    ('website', 'website', links.get('website')),
+                    ('cover_letter', 'cover letter', draft.get('cover_letter') if draft else None),
+                ]
+                
+                # Live-mode fills are queued and applied together in one round-trip
+                pending_fills = []
+                for field_type, label, value in fill_plan:
+                    if not value or not detected_fields[field_type]:
+                        continue
+                    selector = detected_fields[field_type][0]  # Fill first matching field
+                    if self.dry_run:
+                        shown = '[draft content]' if field_type == 'cover_letter' else value
+                        logger.info(f"[DRY RUN] Would fill {label}: {selector} = {shown}")
+                        result['fields_filled'][field_type] = 'dry_run'
+                    else:
+                        pending_fills.append({'field': field_type, 'selector': selector, 'value': value})
+                
+                if pending_fills:
+                    filled = await self.bulk_fill_fields(page, pending_fills)
+                    result['fields_filled'].update(filled)
+                    # A selector that no longer fills means the form changed; re-detect on the next attempt
+                    if not all(filled.values()):
+                        _detection_cache.pop(_detection_key(page.url), None)
+                
+                # Take screenshot for review
+                screenshot_path = await self.take_screenshot(page, job_id)
+                if screenshot_path:
+                    result['screenshot'] = screenshot_path
+                
+                if self.dry_run:
+                    result['status'] = 'dry_run_complete'
+                    result['message'] = f"Dry run completed. Detected {sum(result['fields_detected'].values())} form fields."
+                    if screenshot_path:
+                        result['message'] += " Screenshot saved."
+                    logger.info("✓ DRY RUN: Form mapping completed successfully")
+                else:
+                    # In real mode, look for submit button
+                    # One CSS query covers the attribute-based buttons; text match only if that misses
+                    submit_button = await page.query_selector(SUBMIT_BUTTON_CSS)
+                    if submit_button is None:
+                        text_button = page.get_by_role('button', name=SUBMIT_BUTTON_TEXT_RE).first
+                        if await text_button.count():
+                            submit_button = text_button
+                    
+                    submitted = False
+                    confirmed = True
+                    submit_status = None
+                    if submit_button is not None:
+                        logger.info("Found submit button")
+                        if require_confirm:
+                            confirmed = await self.wait_for_confirmation(job_id)
+                        if confirmed:
+                            submit_status = await self.click_submit(page, submit_button)
+                            submitted = submit_status is not None and submit_status < 400
+                    
+                    if submitted:
+                        result['status'] = 'submitted'
+                        result['message'] = 'Application submitted successfully'
+                    elif submit_button is not None and confirmed:
+                        result['status'] = 'manual_required'
+                        if submit_status is None:
+                            result['message'] = 'No response to the submission. Check the application and submit manually if needed.'
+                        else:
+                            result['message'] = f'Submission was rejected (HTTP {submit_status}). Manual submission required.'
+                    elif not confirmed:
+                        result['status'] = 'manual_required'
+                        result['message'] = 'Submission was not confirmed in time. Manual submission required.'
+                    else:
+                        result['status'] = 'manual_required'
+                        result['message'] = 'Could not find submit button. Manual submission required.'
+                
+                # Log application
+                db.enqueue_log(
+                    job_id=job_id,
+                    profile_id=profile_id,
+                    job_url=job['url'],
+                    company=job['company'],
+                    action='apply',
+                    status=result['status'],
+                    draft_id=draft['id'] if draft else None,
+                    draft_content=draft['cover_letter'] if draft else None
+                )
+                
         except Exception as e:
             logger.error(f"Application error: {e}")
             result['status'] = 'error'
             result['message'] = str(e)
             
             # Log error
-            db.log_application(
+            db.enqueue_log(
                 job_id=job_id,
                 profile_id=profile_id,
                 job_url=job.get('url', ''),
@@ -325,6 +582,67 @@ class ApplicationAutomation:
         
         return result
 
+    async def apply_to_jobs(self, job_ids: List[int], profile_id: int = 1,
+                            concurrency: int = 4) -> List[Dict]:
+        """
+        Apply to several jobs concurrently over the shared page pool.
+        Returns: one result per job, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def apply_one(job_id: int):
+            async with semaphore:
+                return await self.apply_to_job(job_id, profile_id=profile_id, require_confirm=False)
+        
+        outcomes = await asyncio.gather(*map(apply_one, job_ids), return_exceptions=True)
+        
+        results = []
+        for job_id, outcome in zip(job_ids, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Application error for job {job_id}: {outcome}")
+                outcome = {
+                    'job_id': job_id,
+                    'status': 'error',
+                    'message': str(outcome),
+                    'dry_run': self.dry_run,
+                    'fields_filled': {},
+                    'fields_detected': {}
+                }
+            results.append(outcome)
+        return results
+
+
+# Live submissions waiting for operator approval, keyed by job id
+_pending_confirmations: Dict[int, asyncio.Event] = {}
+
+
+def confirm_submission(job_id: int) -> bool:
+    """
+    Release a submission held by require_manual_confirm.
+    Returns: False if no submission for this job is waiting
+    """
+    event = _pending_confirmations.get(job_id)
+    if event is None:
+        return False
+    event.set()
+    return True
+
+
+# Singleton instance
+_browser_pool = None
+
+def get_browser_pool() -> BrowserPool:
+    """Get browser pool singleton instance."""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(
+            max_pages=int(os.getenv("BROWSER_MAX_PAGES", "4")),
+            user_data_dir=os.getenv("BROWSER_USER_DATA_DIR") or None,
+            block_resources=os.getenv("BROWSER_BLOCK_RESOURCES", "true").lower() == "true",
+            headless=os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+        )
+    return _browser_pool
+
 
 async def main():
     """Test applier."""
@@ -339,7 +657,11 @@ async def main():
         print(f"Message: {result['message']}")
     else:
         print("No jobs in database to apply to")
+    
+    await get_browser_pool().shutdown()
+    await shutdown_playwright()
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Shared Playwright runtime for AutoCareer.
+Starts the Playwright driver and Chromium once per process and hands them
+to the scraper and the application browser pool.
+"""
+
+import asyncio
+from typing import Dict, Optional
+from playwright.async_api import async_playwright, Playwright, Browser
+import logging
+import sys
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+# Chromium flags for automation; the sandbox stays on since we browse arbitrary job sites
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-background-timer-throttling",
+]
+
+# Process-wide driver and one browser per headless mode, created on first use
+_playwright: Optional[Playwright] = None
+_browsers: Dict[bool, Browser] = {}
+_lock = asyncio.Lock()
+
+
+async def _ensure_playwright() -> Playwright:
+    """Start the Playwright driver if needed. Caller must hold _lock."""
+    global _playwright
+    if _playwright is None:
+        _playwright = await async_playwright().start()
+        logger.info("Started shared Playwright driver")
+    return _playwright
+
+
+async def get_playwright() -> Playwright:
+    """Get the shared Playwright driver, starting it on first use."""
+    async with _lock:
+        return await _ensure_playwright()
+
+
+async def get_browser(headless: bool = True) -> Browser:
+    """Get the shared Chromium instance for the given mode, launching it on first use."""
+    async with _lock:
+        browser = _browsers.get(headless)
+        if browser is None or not browser.is_connected():
+            playwright = await _ensure_playwright()
+            browser = await playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+            _browsers[headless] = browser
+        return browser
+
+
+async def shutdown_playwright():
+    """Close every shared browser and stop the driver."""
+    global _playwright
+    async with _lock:
+        for browser in _browsers.values():
+            if browser.is_connected():
+                await browser.close()
+        _browsers.clear()
+        if _playwright:
+            await _playwright.stop()
+        _playwright = None
@@ -3,30 +3,159 @@ Database schemas and setup for AutoCareer application.
 All data stored locally for privacy and security.
 """
 
+import asyncio
+import itertools
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-import json
 import os
+import re
+import orjson
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Attempts per queued log batch while SQLite is busy (e.g. locked by another worker);
+# the wait before each retry grows by LOG_WRITE_RETRY_DELAY seconds
+LOG_WRITE_ATTEMPTS = 3
+LOG_WRITE_RETRY_DELAY = 0.5
+
+# Profile link classifier; a bare "linkedin"/"github" without .com is neither
+_LINK_RE = re.compile(r'(linkedin|github)(\.com)?', re.IGNORECASE)
+
+
+def classify_links(links: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Sort a comma-separated link list into LinkedIn, GitHub and website in one pass.
+    Returns: first link of each kind (None if absent)
+    """
+    urls = {'linkedin': None, 'github': None, 'website': None}
+    for link in (links or '').split(','):
+        link = link.strip()
+        if not link:
+            continue
+        match = _LINK_RE.search(link)
+        if not match:
+            key = 'website'
+        elif match.group(2):
+            key = match.group(1).lower()
+        else:
+            continue
+        if urls[key] is None:
+            urls[key] = link
+    return urls
+
+
+def links_to_json(links) -> str:
+    """Serialize profile links (CSV string or dict) to the links_json column format."""
+    if not isinstance(links, dict):
+        links = classify_links(links)
+    return orjson.dumps({key: url for key, url in links.items() if url}).decode()
+
+
+class _RowCache:
+    """Thread-safe LRU of row dicts with an optional time-to-live."""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._rows: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key) -> Optional[Dict]:
+        """Return a copy of the cached row, or None if absent or expired."""
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None:
+                return None
+            expires_at, row = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._rows[key]
+                return None
+            self._rows.move_to_end(key)
+            return dict(row)
+    
+    def put(self, key, row: Dict):
+        """Cache a copy of row, evicting the least recently used entry."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._rows[key] = (expires_at, dict(row))
+            self._rows.move_to_end(key)
+            if len(self._rows) > self.maxsize:
+                self._rows.popitem(last=False)
+    
+    def pop(self, key):
+        """Drop a cached row."""
+        with self._lock:
+            self._rows.pop(key, None)
 
 
 class Database:
     """Local SQLite database manager for AutoCareer."""
     
+    # Hot statements kept as constants so the statement cache always hits
+    SELECT_PROFILE_SQL = "SELECT * FROM profiles WHERE id = ?"
+    SELECT_JOB_SQL = "SELECT * FROM jobs WHERE id = ?"
+    SELECT_DRAFT_BY_JOB_SQL = "SELECT * FROM drafts WHERE job_id = ? ORDER BY generated_at DESC LIMIT 1"
+    INSERT_APPLICATION_LOG_SQL = """
+        INSERT INTO application_logs 
+        (job_id, profile_id, draft_id, job_url, company, action, status, draft_content, error_message)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
     def __init__(self, db_path: str = "./backend/data/autocareer.db"):
         """Initialize database connection and create tables."""
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        # One connection per thread; WAL lets them read and write concurrently
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._create_tables()
+        # Read-through caches for get_profile / get_job; jobs expire since the analyzer updates them,
+        # profiles since other uvicorn workers' writes only invalidate their own cache
+        self._profile_cache = _RowCache(maxsize=16, ttl=5)
+        self._job_cache = _RowCache(maxsize=1024, ttl=60)
+        # Bumped on every profile/job write in this process; lets callers cache derived data
+        self._versions = itertools.count(1)
+        self.profiles_version = 0
+        self.jobs_version = 0
+        # Background log writer state (see start_log_writer)
+        self._log_queue: Optional[asyncio.Queue] = None
+        self._log_writer_task: Optional[asyncio.Task] = None
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            # WAL + relaxed fsync: readers don't block writers, commits stay cheap
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread."""
+        return self._get_conn()
     
     def _create_tables(self):
         """Create all required database tables."""
+        conn = self._get_conn()
+        cur = conn.cursor()
         
         # User Profile table - stores resume data and embeddings metadata
-        self.cursor.execute("""
+        cur.execute("""
             CREATE TABLE IF NOT EXISTS profiles (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
@@ -36,7 +165,7 @@ class Database:
                 skills TEXT,
                 experience TEXT,
                 education TEXT,
-                links TEXT,
+                links_json TEXT,
                 vector_db_id TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -44,7 +173,7 @@ class Database:
         """)
         
         # Jobs table - stores scraped job postings
-        self.cursor.execute("""
+        cur.execute("""
             CREATE TABLE IF NOT EXISTS jobs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 title TEXT NOT NULL,
@@ -65,7 +194,7 @@ class Database:
         """)
         
         # Application Drafts table - stores generated cover letters
-        self.cursor.execute("""
+        cur.execute("""
             CREATE TABLE IF NOT EXISTS drafts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 job_id INTEGER NOT NULL,
@@ -82,7 +211,7 @@ class Database:
         """)
         
         # Application Logs table - immutable audit trail
-        self.cursor.execute("""
+        cur.execute("""
             CREATE TABLE IF NOT EXISTS application_logs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 job_id INTEGER NOT NULL,
@@ -102,7 +231,7 @@ class Database:
         """)
         
         # Credentials table - encrypted local storage for LinkedIn/Greenhouse
-        self.cursor.execute("""
+        cur.execute("""
             CREATE TABLE IF NOT EXISTS credentials (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 service TEXT UNIQUE NOT NULL,
@@ -115,7 +244,7 @@ class Database:
         """)
         
         # Application Queue table - tracks submission queue
-        self.cursor.execute("""
+        cur.execute("""
             CREATE TABLE IF NOT EXISTS queue (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 job_id INTEGER NOT NULL,
@@ -131,26 +260,127 @@ class Database:
             )
         """)
         
-        self.conn.commit()
+        # Skills Cache table - tracks HTTP submission success rate per ATS host
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS skills_cache (
+                host TEXT PRIMARY KEY,
+                attempts INTEGER DEFAULT 0,
+                successes INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Analysis Cache table - LLM scores keyed by a hash of the full scoring request
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                hash TEXT PRIMARY KEY,
+                score REAL NOT NULL,
+                rationale TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Scrape caches - job page extractions by URL, and search result cards by query;
+        # fetched_at is a Unix timestamp compared against each cache's TTL
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS job_details_cache (
+                url TEXT PRIMARY KEY,
+                description TEXT NOT NULL,
+                requirements TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                query TEXT PRIMARY KEY,
+                jobs_json TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        
+        # Migrate the old CSV links column to structured JSON
+        profile_columns = {row['name'] for row in cur.execute("PRAGMA table_info(profiles)")}
+        if 'links_json' not in profile_columns:
+            cur.execute("ALTER TABLE profiles ADD COLUMN links_json TEXT")
+            rows = cur.execute("SELECT id, links FROM profiles").fetchall()
+            cur.executemany(
+                "UPDATE profiles SET links_json = ? WHERE id = ?",
+                [(links_to_json(row['links']), row['id']) for row in rows]
+            )
+        
+        # Indexes for hot lookups (jobs.url is already indexed by its UNIQUE constraint)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_drafts_job_generated ON drafts(job_id, generated_at DESC)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status_fit ON jobs(status, fit_score DESC, scraped_at DESC)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_fit ON jobs(fit_score DESC, scraped_at DESC)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_queue_status_pri ON queue(status, priority DESC, id ASC)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_logs_ts ON application_logs(timestamp DESC)"
+        )
+        
+        conn.commit()
     
     # Profile operations
     def insert_profile(self, name: str, email: str, resume_text: str, 
                       skills: str = None, experience: str = None, 
                       education: str = None, links: str = None,
                       vector_db_id: str = None) -> int:
-        """Insert or update user profile."""
-        self.cursor.execute("""
-            INSERT INTO profiles (name, email, resume_text, skills, experience, education, links, vector_db_id)
+        """Insert or update user profile. Links are stored pre-classified as JSON."""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO profiles (name, email, resume_text, skills, experience, education, links_json, vector_db_id)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (name, email, resume_text, skills, experience, education, links, vector_db_id))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        """, (name, email, resume_text, skills, experience, education,
+              links_to_json(links), vector_db_id))
+        conn.commit()
+        self.invalidate_profile(cur.lastrowid)
+        return cur.lastrowid
+    
+    def update_profile_resume(self, profile_id: int, resume_text: str,
+                              skills: str = None, experience: str = None,
+                              education: str = None, links: str = None,
+                              vector_db_id: str = None):
+        """Replace a profile's parsed resume data."""
+        conn = self._get_conn()
+        conn.execute("""
+            UPDATE profiles 
+            SET resume_text = ?, skills = ?, experience = ?, education = ?, 
+                links_json = ?, vector_db_id = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (resume_text, skills, experience, education, links_to_json(links),
+              vector_db_id, profile_id))
+        conn.commit()
+        self.invalidate_profile(profile_id)
+    
+    def invalidate_profile(self, profile_id: int):
+        """Drop a profile from the read cache after it changes."""
+        self._profile_cache.pop(profile_id)
+        self.profiles_version = next(self._versions)
     
     def get_profile(self, profile_id: int = 1) -> Optional[Dict]:
-        """Retrieve profile by ID."""
-        self.cursor.execute("SELECT * FROM profiles WHERE id = ?", (profile_id,))
-        row = self.cursor.fetchone()
-        return dict(row) if row else None
+        """Retrieve profile by ID (cached until the profile is written)."""
+        cached = self._profile_cache.get(profile_id)
+        if cached is not None:
+            return cached
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(self.SELECT_PROFILE_SQL, (profile_id,))
+        row = cur.fetchone()
+        if not row:
+            return None
+        profile = dict(row)
+        # {'linkedin': ..., 'github': ..., 'website': ...} with absent kinds omitted
+        profile['links'] = orjson.loads(profile.pop('links_json') or '{}')
+        self._profile_cache.put(profile_id, profile)
+        return profile
     
     # Job operations
     def insert_job(self, title: str, company: str, url: str, source: str,
@@ -158,64 +388,143 @@ class Database:
                    salary_max: int = None, description: str = None,
                    requirements: str = None) -> int:
         """Insert scraped job posting."""
+        conn = self._get_conn()
+        cur = conn.cursor()
         try:
-            self.cursor.execute("""
+            cur.execute("""
                 INSERT INTO jobs (title, company, location, salary_min, salary_max, 
                                 description, requirements, url, source)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (title, company, location, salary_min, salary_max, 
                   description, requirements, url, source))
-            self.conn.commit()
-            return self.cursor.lastrowid
+            conn.commit()
+            self.jobs_version = next(self._versions)
+            return cur.lastrowid
         except sqlite3.IntegrityError:
             # Job URL already exists
-            self.cursor.execute("SELECT id FROM jobs WHERE url = ?", (url,))
-            return self.cursor.fetchone()[0]
+            cur.execute("SELECT id FROM jobs WHERE url = ?", (url,))
+            return cur.fetchone()[0]
+    
+    def insert_jobs_many(self, jobs: List[Dict]) -> List[int]:
+        """
+        Insert scraped job postings in a single transaction.
+        Returns: job ids in input order (existing ids for known URLs)
+        """
+        if not jobs:
+            return []
+        
+        conn = self._get_conn()
+        cur = conn.cursor()
+        rows = [
+            (job['title'], job['company'], job.get('location'), job.get('salary_min'),
+             job.get('salary_max'), job.get('description'), job.get('requirements'),
+             job['url'], job['source'])
+            for job in jobs
+        ]
+        with conn:
+            cur.executemany("""
+                INSERT OR IGNORE INTO jobs (title, company, location, salary_min, salary_max, 
+                                          description, requirements, url, source)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        self.jobs_version = next(self._versions)
+        
+        # Resolve ids by URL in chunks to stay under SQLite's variable limit
+        urls = [job['url'] for job in jobs]
+        ids_by_url = {}
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            cur.execute(
+                f"SELECT id, url FROM jobs WHERE url IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            ids_by_url.update({row['url']: row['id'] for row in cur.fetchall()})
+        return [ids_by_url.get(url) for url in urls]
     
     def update_job_analysis(self, job_id: int, fit_score: float, 
                            fit_rationale: str, status: str = 'analyzed'):
         """Update job with fit score and analysis."""
-        self.cursor.execute("""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("""
             UPDATE jobs 
             SET fit_score = ?, fit_rationale = ?, status = ?, analyzed_at = ?
             WHERE id = ?
         """, (fit_score, fit_rationale, status, datetime.now(), job_id))
-        self.conn.commit()
+        conn.commit()
+        self.invalidate_job(job_id)
+    
+    def update_job_analyses_many(self, analyses: List[tuple], status: str = 'analyzed'):
+        """Store (job_id, fit_score, fit_rationale) for many jobs in one transaction."""
+        if not analyses:
+            return
+        
+        conn = self._get_conn()
+        analyzed_at = datetime.now()
+        with conn:
+            conn.executemany("""
+                UPDATE jobs 
+                SET fit_score = ?, fit_rationale = ?, status = ?, analyzed_at = ?
+                WHERE id = ?
+            """, [(score, rationale, status, analyzed_at, job_id)
+                  for job_id, score, rationale in analyses])
+        for job_id, _, _ in analyses:
+            self.invalidate_job(job_id)
+    
+    def invalidate_job(self, job_id: int):
+        """Drop a job from the read cache after it changes."""
+        self._job_cache.pop(job_id)
+        self.jobs_version = next(self._versions)
     
     def get_job(self, job_id: int) -> Optional[Dict]:
-        """Retrieve job by ID."""
-        self.cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-        row = self.cursor.fetchone()
-        return dict(row) if row else None
+        """Retrieve job by ID (cached for up to a minute)."""
+        cached = self._job_cache.get(job_id)
+        if cached is not None:
+            return cached
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(self.SELECT_JOB_SQL, (job_id,))
+        row = cur.fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        self._job_cache.put(job_id, job)
+        return job
     
     def get_jobs(self, status: str = None, limit: int = 50) -> List[Dict]:
         """Retrieve jobs with optional status filter."""
+        conn = self._get_conn()
+        cur = conn.cursor()
         if status:
-            self.cursor.execute(
+            cur.execute(
                 "SELECT * FROM jobs WHERE status = ? ORDER BY fit_score DESC, scraped_at DESC LIMIT ?",
                 (status, limit)
             )
         else:
-            self.cursor.execute(
+            cur.execute(
                 "SELECT * FROM jobs ORDER BY fit_score DESC, scraped_at DESC LIMIT ?",
                 (limit,)
             )
-        return [dict(row) for row in self.cursor.fetchall()]
+        return [dict(row) for row in cur.fetchall()]
     
     # Draft operations
     def insert_draft(self, job_id: int, profile_id: int, cover_letter: str,
                     custom_answers: str = None, company_context: str = None) -> int:
         """Insert generated application draft."""
-        self.cursor.execute("""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("""
             INSERT INTO drafts (job_id, profile_id, cover_letter, custom_answers, company_context)
             VALUES (?, ?, ?, ?, ?)
         """, (job_id, profile_id, cover_letter, custom_answers, company_context))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        conn.commit()
+        return cur.lastrowid
     
     def update_draft(self, draft_id: int, cover_letter: str = None, 
                     custom_answers: str = None, status: str = None):
         """Update draft content or status."""
+        conn = self._get_conn()
+        cur = conn.cursor()
         updates = []
         values = []
         if cover_letter:
@@ -234,60 +543,161 @@ class Database:
             values.append(draft_id)
             
             query = f"UPDATE drafts SET {', '.join(updates)} WHERE id = ?"
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            cur.execute(query, values)
+            conn.commit()
     
     def get_draft(self, draft_id: int) -> Optional[Dict]:
         """Retrieve draft by ID."""
-        self.cursor.execute("SELECT * FROM drafts WHERE id = ?", (draft_id,))
-        row = self.cursor.fetchone()
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("SELECT * FROM drafts WHERE id = ?", (draft_id,))
+        row = cur.fetchone()
         return dict(row) if row else None
     
     def get_draft_by_job(self, job_id: int) -> Optional[Dict]:
         """Retrieve draft by job ID."""
-        self.cursor.execute(
-            "SELECT * FROM drafts WHERE job_id = ? ORDER BY generated_at DESC LIMIT 1",
-            (job_id,)
-        )
-        row = self.cursor.fetchone()
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(self.SELECT_DRAFT_BY_JOB_SQL, (job_id,))
+        row = cur.fetchone()
         return dict(row) if row else None
     
     # Application log operations (immutable)
+    @staticmethod
+    def _log_row(job_id: int, profile_id: int, job_url: str, company: str,
+                 action: str, status: str, draft_id: int = None,
+                 draft_content: str = None, error_message: str = None) -> tuple:
+        """Order log fields to match INSERT_APPLICATION_LOG_SQL."""
+        return (job_id, profile_id, draft_id, job_url, company, action, status,
+                draft_content, error_message)
+    
     def log_application(self, job_id: int, profile_id: int, job_url: str,
                        company: str, action: str, status: str,
                        draft_id: int = None, draft_content: str = None,
                        error_message: str = None) -> int:
         """Log application action (immutable audit trail)."""
-        self.cursor.execute("""
-            INSERT INTO application_logs 
-            (job_id, profile_id, draft_id, job_url, company, action, status, draft_content, error_message)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (job_id, profile_id, draft_id, job_url, company, action, status, draft_content, error_message))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(self.INSERT_APPLICATION_LOG_SQL, self._log_row(
+            job_id, profile_id, job_url, company, action, status,
+            draft_id, draft_content, error_message
+        ))
+        conn.commit()
+        return cur.lastrowid
+    
+    def enqueue_log(self, **row):
+        """
+        Queue an application log row for the background writer.
+        Writes immediately when no writer is running (e.g. CLI usage).
+        """
+        if self._log_queue is None:
+            self.log_application(**row)
+            return
+        if self._log_writer_task is None or self._log_writer_task.done():
+            # The writer has stopped; write what it left behind rather than queueing for nobody
+            self._flush_log_queue()
+            self.log_application(**row)
+            return
+        self._log_queue.put_nowait(self._log_row(**row))
+    
+    def _write_logs(self, rows: List[tuple]):
+        """Insert a batch of log rows in one transaction."""
+        conn = self._get_conn()
+        with conn:
+            conn.executemany(self.INSERT_APPLICATION_LOG_SQL, rows)
+    
+    def start_log_writer(self, batch_size: int = 64, max_wait: float = 0.5):
+        """Start the background task that batches queued log rows."""
+        if self._log_writer_task is None:
+            self._log_queue = asyncio.Queue()
+            self._log_writer_task = asyncio.create_task(self._log_writer(batch_size, max_wait))
+    
+    async def _log_writer(self, batch_size: int, max_wait: float):
+        """Drain up to batch_size rows (or max_wait seconds) per write."""
+        loop = asyncio.get_running_loop()
+        while True:
+            rows = [await self._log_queue.get()]
+            deadline = loop.time() + max_wait
+            try:
+                while len(rows) < batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        rows.append(await asyncio.wait_for(self._log_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            finally:
+                # Runs on cancellation too, so rows already pulled are never lost
+                await self._write_log_batch(rows)
+    
+    async def _write_log_batch(self, rows: List[tuple]):
+        """Write a batch off the event loop, retrying while the database is busy."""
+        for attempt in range(1, LOG_WRITE_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(self._write_logs, rows)
+                return
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Application log write failed (attempt {attempt}/{LOG_WRITE_ATTEMPTS}): {e}")
+                if attempt < LOG_WRITE_ATTEMPTS:
+                    await asyncio.sleep(LOG_WRITE_RETRY_DELAY * attempt)
+            except Exception as e:
+                logger.error(f"Dropped {len(rows)} application log rows: {e}")
+                return
+        # Still busy: requeue so a later batch (or the shutdown flush) writes them
+        for row in rows:
+            self._log_queue.put_nowait(row)
+    
+    async def stop_log_writer(self):
+        """Stop the background writer and flush anything still queued."""
+        if self._log_writer_task is not None:
+            self._log_writer_task.cancel()
+            try:
+                await self._log_writer_task
+            except asyncio.CancelledError:
+                pass
+            self._log_writer_task = None
+        self._flush_log_queue()
+        self._log_queue = None
+    
+    def _flush_log_queue(self):
+        """Synchronously write any rows left in the queue."""
+        if self._log_queue is None:
+            return
+        rows = []
+        while not self._log_queue.empty():
+            rows.append(self._log_queue.get_nowait())
+        if rows:
+            self._write_logs(rows)
     
     def get_application_logs(self, limit: int = 100) -> List[Dict]:
         """Retrieve application logs."""
-        self.cursor.execute(
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(
             "SELECT * FROM application_logs ORDER BY timestamp DESC LIMIT ?",
             (limit,)
         )
-        return [dict(row) for row in self.cursor.fetchall()]
+        return [dict(row) for row in cur.fetchall()]
     
     # Queue operations
     def add_to_queue(self, job_id: int, profile_id: int, draft_id: int,
                     priority: int = 0) -> int:
         """Add application to submission queue."""
-        self.cursor.execute("""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("""
             INSERT INTO queue (job_id, profile_id, draft_id, priority)
             VALUES (?, ?, ?, ?)
         """, (job_id, profile_id, draft_id, priority))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        conn.commit()
+        return cur.lastrowid
     
     def get_queue(self, status: str = 'pending') -> List[Dict]:
         """Retrieve queue items."""
-        self.cursor.execute("""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("""
             SELECT q.*, j.title, j.company, j.url, d.cover_letter
             FROM queue q
             JOIN jobs j ON q.job_id = j.id
@@ -295,26 +705,121 @@ class Database:
             WHERE q.status = ?
             ORDER BY q.priority DESC, q.id ASC
         """, (status,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return [dict(row) for row in cur.fetchall()]
     
     def update_queue_status(self, queue_id: int, status: str):
         """Update queue item status."""
+        conn = self._get_conn()
+        cur = conn.cursor()
         timestamp_field = "submitted_at" if status == "submitted" else None
         if timestamp_field:
-            self.cursor.execute(
+            cur.execute(
                 f"UPDATE queue SET status = ?, {timestamp_field} = ? WHERE id = ?",
                 (status, datetime.now(), queue_id)
             )
         else:
-            self.cursor.execute(
+            cur.execute(
                 "UPDATE queue SET status = ? WHERE id = ?",
                 (status, queue_id)
             )
-        self.conn.commit()
+        conn.commit()
+    
+    # Skill operations
+    def record_skill_result(self, host: str, success: bool):
+        """Record the outcome of an HTTP submission skill for a host."""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO skills_cache (host, attempts, successes, updated_at)
+            VALUES (?, 1, ?, ?)
+            ON CONFLICT(host) DO UPDATE SET
+                attempts = attempts + 1,
+                successes = successes + excluded.successes,
+                updated_at = excluded.updated_at
+        """, (host, 1 if success else 0, datetime.now()))
+        conn.commit()
+    
+    def is_skill_enabled(self, host: str, min_attempts: int = 5,
+                         min_success_rate: float = 0.5) -> bool:
+        """Check whether a host's skill has a good enough track record to use."""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT attempts, successes FROM skills_cache WHERE host = ?",
+            (host,)
+        )
+        row = cur.fetchone()
+        if not row or row['attempts'] < min_attempts:
+            return True
+        return row['successes'] / row['attempts'] >= min_success_rate
+    
+    # Analysis cache operations
+    def get_cached_analysis(self, key: str) -> Optional[tuple]:
+        """Return a cached (score, rationale) for a scoring request hash."""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute("SELECT score, rationale FROM analysis_cache WHERE hash = ?", (key,))
+        row = cur.fetchone()
+        return (row['score'], row['rationale']) if row else None
+    
+    def cache_analysis(self, key: str, score: float, rationale: str):
+        """Store an LLM score under its scoring request hash."""
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_cache (hash, score, rationale) VALUES (?, ?, ?)",
+            (key, score, rationale)
+        )
+        conn.commit()
+    
+    # Scrape cache operations
+    def get_cached_job_details(self, url: str, max_age: float) -> Optional[Dict]:
+        """Return cached {description, requirements} for a job URL fetched within max_age seconds."""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT description, requirements FROM job_details_cache WHERE url = ? AND fetched_at > ?",
+            (url, time.time() - max_age)
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
+    
+    def cache_job_details(self, url: str, description: str, requirements: str):
+        """Store the description and requirements extracted from a job URL."""
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO job_details_cache (url, description, requirements, fetched_at) VALUES (?, ?, ?, ?)",
+            (url, description, requirements, time.time())
+        )
+        conn.commit()
+    
+    def get_cached_search(self, query: str, max_age: float) -> Optional[List[Dict]]:
+        """Return jobs cached for a search query within max_age seconds."""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT jobs_json FROM search_cache WHERE query = ? AND fetched_at > ?",
+            (query, time.time() - max_age)
+        )
+        row = cur.fetchone()
+        return orjson.loads(row['jobs_json']) if row else None
+    
+    def cache_search(self, query: str, jobs: List[Dict]):
+        """Store the jobs a search query returned."""
+        conn = self._get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO search_cache (query, jobs_json, fetched_at) VALUES (?, ?, ?)",
+            (query, orjson.dumps(jobs).decode(), time.time())
+        )
+        conn.commit()
     
     def close(self):
-        """Close database connection."""
-        self.conn.close()
+        """Close all database connections."""
+        self._flush_log_queue()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
 
 # Singleton instance
@@ -0,0 +1,15 @@
+"""
+Event loop setup for AutoCareer's command-line entry points.
+"""
+
+
+def install_uvloop():
+    """
+    Run asyncio on uvloop when it is available, matching the server.
+    uvloop ships with uvicorn[standard] (not on Windows); without it the default loop is kept.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
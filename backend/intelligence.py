@@ -4,15 +4,23 @@ Scores jobs against resume and generates customized cover letters using RAG.
 HARDENED VERSION: Robust error handling and graceful fallbacks.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
 import re
-from typing import Dict, List, Optional, Tuple
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import httpx
+import numpy as np
+import orjson
+from selectolax.parser import HTMLParser
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 from database import get_db
-from profile_engine import ProfileEngine
+from event_loop import install_uvloop
+from profile_engine import get_profile_engine
 import logging
 import sys
 
@@ -26,6 +34,329 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Common ML/tech keywords
+KEYWORDS = [
+    'python', 'java', 'javascript', 'c++', 'machine learning', 'deep learning',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'sql', 'nosql',
+    'aws', 'gcp', 'azure', 'docker', 'kubernetes', 'git', 'nlp', 'computer vision',
+    'data science', 'statistics', 'algorithms', 'distributed systems', 'api',
+    'rest', 'graphql', 'react', 'node.js', 'typescript', 'mongodb', 'postgresql',
+    'neural networks', 'transformers', 'llm', 'bert', 'gpt', 'reinforcement learning',
+    'hadoop', 'spark', 'kafka', 'redis', 'elasticsearch', 'airflow', 'mlops'
+]
+# One alternation scans the text once; lookarounds act as word boundaries that
+# also work next to symbols like "c++" ("git" no longer matches inside "github",
+# while plurals such as "APIs" still count)
+KEYWORD_RE = re.compile(
+    r'(?<![a-z0-9])(' + '|'.join(map(re.escape, sorted(KEYWORDS, key=len, reverse=True))) + r')s?(?![a-z0-9])',
+    re.IGNORECASE
+)
+
+
+# Column of each keyword in the bulk-scoring keyword matrix
+KEYWORD_INDEX = {keyword: i for i, keyword in enumerate(KEYWORDS)}
+
+
+def _keyword_vector(text: str) -> np.ndarray:
+    """Boolean row marking which KEYWORDS appear in text."""
+    vector = np.zeros(len(KEYWORDS), dtype=np.bool_)
+    if text:
+        vector[[KEYWORD_INDEX[kw] for kw in _extract_keywords_cached(text)]] = True
+    return vector
+
+
+def _overlap_scores_numpy(job_matrix: np.ndarray, resume_vec: np.ndarray) -> np.ndarray:
+    """Keyword-overlap score per job row; 50 for jobs without any keywords."""
+    job_counts = job_matrix.sum(axis=1)
+    return np.where(
+        job_counts > 0,
+        100.0 * (job_matrix & resume_vec).sum(axis=1) / np.maximum(job_counts, 1),
+        50.0  # Neutral score when no keywords found
+    )
+
+
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def _overlap_scores(job_matrix, resume_vec):
+        """Numba kernel for _overlap_scores_numpy: one fused pass per job, jobs in parallel."""
+        out = np.empty(job_matrix.shape[0])
+        for i in prange(job_matrix.shape[0]):
+            overlap = 0
+            job_count = 0
+            for k in range(job_matrix.shape[1]):
+                if job_matrix[i, k]:
+                    job_count += 1
+                    if resume_vec[k]:
+                        overlap += 1
+            out[i] = 50.0 if job_count == 0 else min(100.0 * overlap / job_count, 100.0)
+        return out
+except ImportError:
+    # Numba is optional; the NumPy version gives identical scores
+    _overlap_scores = _overlap_scores_numpy
+
+
+def _keyword_rationale(keyword_score: float, matching: List[str]) -> str:
+    """Explain a keyword-overlap score."""
+    rationale = f"Keyword overlap score: {keyword_score:.1f}/100. "
+    
+    if matching:
+        rationale += f"Matching skills: {', '.join(matching[:10])}. "
+    else:
+        rationale += "No direct skill matches found. "
+    
+    if keyword_score > 70:
+        rationale += "Strong technical alignment."
+    elif keyword_score > 40:
+        rationale += "Moderate technical alignment."
+    else:
+        rationale += "Limited technical alignment."
+    
+    return rationale
+
+
+# Constant across every scoring call, so OpenAI's prompt cache can reuse it
+SCORE_RUBRIC = """You are an expert technical recruiter specializing in ML/AI and software engineering roles. You provide precise, evidence-based candidate assessments with specific examples from their background. Your task is to provide a precise, data-driven assessment of candidate-job fit for the candidate profile and job posting you are given.
+
+ANALYSIS FRAMEWORK:
+Evaluate the following dimensions (0-100 each):
+1. Technical Skills Match: Does the candidate have the required technical stack? (programming languages, frameworks, tools)
+2. Experience Level Alignment: Does the candidate's years of experience match the seniority level? (junior: 0-2y, mid: 2-5y, senior: 5+y)
+3. Domain Expertise: Does the candidate have relevant domain experience? (e.g., NLP, computer vision, MLOps, etc.)
+4. Required vs Nice-to-Have: What percentage of "required" vs "nice-to-have" qualifications does the candidate meet?
+
+SCORING RUBRIC:
+- 90-100: Exceptional fit - Candidate exceeds most requirements
+- 75-89: Strong fit - Candidate meets all core requirements plus some preferred
+- 60-74: Good fit - Candidate meets most core requirements
+- 40-59: Moderate fit - Candidate meets some requirements, gaps exist
+- 0-39: Poor fit - Significant misalignment with requirements
+
+INSTRUCTIONS:
+1. Calculate an overall fit score (0-100) using the framework above
+2. Provide a detailed rationale with:
+   - Specific matching skills/technologies (list 3-5)
+   - Key strengths that align with the role
+   - Any notable gaps or missing qualifications
+   - Experience level assessment
+
+"""
+SCORE_SYSTEM_PROMPT = SCORE_RUBRIC + """Format your response EXACTLY as:
+SCORE: [number between 0-100]
+RATIONALE: [Your detailed analysis - 3-4 sentences covering matches, strengths, and gaps]
+"""
+# Same rubric when several numbered jobs share one request; the reply shape comes from SCORE_GROUP_SCHEMA
+SCORE_GROUP_SYSTEM_PROMPT = SCORE_RUBRIC + """You will receive several numbered job postings for the same candidate. Assess each job independently and return exactly one entry per job with its job_index, score and a 3-4 sentence rationale covering matches, strengths, and gaps.
+"""
+SCORE_GROUP_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "job_scores",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "scores": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "job_index": {"type": "integer"},
+                            "score": {"type": "number"},
+                            "rationale": {"type": "string"}
+                        },
+                        "required": ["job_index", "score", "rationale"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["scores"],
+            "additionalProperties": False
+        }
+    }
+}
+
+def score_cache_key(body: Dict) -> str:
+    """Content hash of a scoring request; any change to prompt, inputs or model is a new key."""
+    payload = orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+# Fields of the SCORE:/RATIONALE: reply format requested by SCORE_SYSTEM_PROMPT
+SCORE_RE = re.compile(r'SCORE:\s*(\d+(?:\.\d+)?)')
+RATIONALE_RE = re.compile(r'RATIONALE:\s*(.+)', re.DOTALL)
+
+# Keyword overlap below which a job is scored by keywords alone, without the LLM
+LLM_PREFILTER_MIN_SCORE = 15
+
+# Fit score at which cover letters are written by gpt-4o instead of gpt-4o-mini
+COVER_LETTER_ESCALATION_SCORE = 80
+
+
+# Near-duplicate postings (cosine >= threshold on the job text) reuse an earlier LLM answer
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_TTL = 24 * 3600
+SEMANTIC_CACHE_SIZE = 1024
+
+
+class SemanticCache:
+    """
+    In-process cache of LLM responses matched by embedding similarity.
+    Entries are grouped in buckets (e.g. per resume); a lookup returns the most similar
+    unexpired entry in its bucket at or above the threshold. When full, the least
+    frequently hit entry is evicted (oldest first on ties).
+    """
+    
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 ttl: float = SEMANTIC_CACHE_TTL, max_entries: int = SEMANTIC_CACHE_SIZE):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._buckets: Dict[Hashable, List[Dict]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def get(self, bucket: Hashable, embedding: np.ndarray, exclude_key: Hashable = None) -> Optional[Any]:
+        """Cached value for the nearest entry in bucket, skipping entries stored under exclude_key."""
+        with self._lock:
+            entries = self._buckets.get(bucket)
+            if not entries:
+                return None
+            now = time.monotonic()
+            live = [entry for entry in entries if now - entry['created'] < self.ttl]
+            self._size -= len(entries) - len(live)
+            self._buckets[bucket] = live
+            candidates = [entry for entry in live if exclude_key is None or entry['key'] != exclude_key]
+            if not candidates:
+                return None
+            similarities = np.stack([entry['embedding'] for entry in candidates]) @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            candidates[best]['hits'] += 1
+            return candidates[best]['value']
+    
+    def put(self, bucket: Hashable, embedding: np.ndarray, value: Any, key: Hashable = None):
+        """Store value for a unit-length embedding; key identifies its source (e.g. job_id)."""
+        with self._lock:
+            self._buckets.setdefault(bucket, []).append({
+                'embedding': np.asarray(embedding, dtype=np.float32),
+                'value': value,
+                'key': key,
+                'created': time.monotonic(),
+                'hits': 0
+            })
+            self._size += 1
+            if self._size > self.max_entries:
+                _, _, victim_bucket, victim_index = min(
+                    ((entry['hits'], entry['created'], b, i)
+                     for b, entries in self._buckets.items() for i, entry in enumerate(entries)),
+                    key=lambda item: item[:2]
+                )
+                del self._buckets[victim_bucket][victim_index]
+                self._size -= 1
+
+
+# Singleton instance
+_semantic_cache = None
+
+def get_semantic_cache() -> SemanticCache:
+    """Get semantic response cache singleton instance."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+    return _semantic_cache
+
+
+# Rough characters-per-token for English text, used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the gpt-4o-mini tokenizer once; None if tiktoken cannot load it."""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, truncating prompts by characters: {e}")
+        return None
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens model tokens."""
+    text = text or ''
+    # Anything this short is under budget however it tokenizes
+    if len(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+# Bytes of HTML downloaded when scraping a company site; far more than the 5000 chars of text we keep
+MAX_COMPANY_HTML_BYTES = 50_000
+
+# Shared keep-alive client for company-site scraping, created on first use
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for company-site scraping."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # Pooled keep-alive connections; connect failures are retried by the transport
+        _http_client = httpx.AsyncClient(
+            timeout=10,
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+            ),
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+
+
+@functools.lru_cache(maxsize=1024)
+def _extract_keywords_cached(text: str) -> Tuple[str, ...]:
+    """Unique keywords in order of first appearance; the resume hits this cache for every job."""
+    return tuple(dict.fromkeys(m.group(1).lower() for m in KEYWORD_RE.finditer(text)))
+
+
+def _overlap_score(resume_keywords: set, job_keywords: set) -> float:
+    """Percentage of the job's keywords found in the resume (50 when the job has none)."""
+    if not job_keywords:
+        return 50.0  # Neutral score when no keywords found
+    
+    if not resume_keywords:
+        return 0.0
+    
+    overlap = len(resume_keywords.intersection(job_keywords))
+    score = overlap / len(job_keywords)
+    
+    return min(score * 100, 100)  # Cap at 100
+
+
+@functools.lru_cache(maxsize=1024)
+def _keyword_overlap_cached(resume_text: str, job_description: str) -> float:
+    """Cached _overlap_score for a (resume, job) text pair."""
+    return _overlap_score(set(_extract_keywords_cached(resume_text)),
+                          set(_extract_keywords_cached(job_description)))
+
 
 class IntelligenceEngine:
     """LLM-based job analysis and cover letter generation."""
@@ -35,7 +366,7 @@ class IntelligenceEngine:
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if self.api_key:
             try:
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = AsyncOpenAI(api_key=self.api_key)
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {e}")
                 self.client = None
@@ -43,28 +374,26 @@ class IntelligenceEngine:
             self.client = None
             logger.warning("No OpenAI API key provided. Using fallback scoring.")
         
-        self.profile_engine = ProfileEngine()
+        # Shared with the API so the embedding model is loaded once per process
+        self.profile_engine = get_profile_engine()
+    
+    async def _job_embedding(self, job: Dict) -> Optional[np.ndarray]:
+        """Unit-length embedding of a job's text for the semantic cache; None if it cannot be computed."""
+        try:
+            return await self.profile_engine.encode_async(
+                f"{job.get('title', '')}\n{job.get('description', '')}\n{job.get('requirements', '')}"
+            )
+        except Exception as e:
+            logger.warning(f"Job embedding unavailable, skipping semantic cache: {e}")
+            return None
     
     def extract_keywords(self, text: str) -> List[str]:
         """Extract technical keywords from text. HARDENED: handles None/empty."""
         if not text:
             return []
         
-        # Common ML/tech keywords
-        keywords = [
-            'python', 'java', 'javascript', 'c++', 'machine learning', 'deep learning',
-            'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'sql', 'nosql',
-            'aws', 'gcp', 'azure', 'docker', 'kubernetes', 'git', 'nlp', 'computer vision',
-            'data science', 'statistics', 'algorithms', 'distributed systems', 'api',
-            'rest', 'graphql', 'react', 'node.js', 'typescript', 'mongodb', 'postgresql',
-            'neural networks', 'transformers', 'llm', 'bert', 'gpt', 'reinforcement learning',
-            'hadoop', 'spark', 'kafka', 'redis', 'elasticsearch', 'airflow', 'mlops'
-        ]
-        
         try:
-            text_lower = text.lower()
-            found_keywords = [kw for kw in keywords if kw in text_lower]
-            return found_keywords
+            return list(_extract_keywords_cached(text))
         except Exception as e:
             logger.error(f"Keyword extraction error: {e}")
             return []
@@ -72,23 +401,44 @@ class IntelligenceEngine:
     def calculate_keyword_overlap(self, resume_text: str, job_description: str) -> float:
         """Calculate keyword overlap between resume and job description. HARDENED."""
         try:
-            resume_keywords = set(self.extract_keywords(resume_text or ""))
-            job_keywords = set(self.extract_keywords(job_description or ""))
-            
-            if not job_keywords:
-                return 50.0  # Neutral score when no keywords found
-            
-            if not resume_keywords:
-                return 0.0
-            
-            overlap = len(resume_keywords.intersection(job_keywords))
-            score = overlap / len(job_keywords)
-            
-            return min(score * 100, 100)  # Cap at 100
+            return _keyword_overlap_cached(resume_text or "", job_description or "")
         except Exception as e:
             logger.error(f"Keyword overlap calculation error: {e}")
             return 50.0  # Neutral fallback
     
+    def _worth_llm_scoring(self, job: Dict, resume_text: str) -> bool:
+        """Cheap keyword pre-filter: False when the overlap is too low for an LLM call to matter."""
+        job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('requirements', '')}"
+        return self.calculate_keyword_overlap(resume_text or "", job_text) >= LLM_PREFILTER_MIN_SCORE
+    
+    def _keyword_sets(self, resume_text: str, job_text: str) -> Tuple[set, set]:
+        """Keyword sets for a resume and a job text."""
+        return set(self.extract_keywords(resume_text)), set(self.extract_keywords(job_text))
+    
+    def score_jobs_fallback_many(self, jobs: List[Dict], resume_text: str) -> List[Tuple[float, str]]:
+        """
+        Keyword-score many jobs against one resume at once.
+        Same scores as score_job_fallback, computed on a (jobs x keywords) boolean matrix.
+        Returns: (score, rationale) per job, in input order
+        """
+        if not jobs:
+            return []
+        try:
+            resume_vec = _keyword_vector(resume_text or "")
+            job_matrix = np.stack([
+                _keyword_vector(f"{job.get('title', '')} {job.get('description', '')} {job.get('requirements', '')}")
+                for job in jobs
+            ])
+            scores = _overlap_scores(job_matrix, resume_vec)
+            matches = job_matrix & resume_vec
+            return [
+                (float(score), _keyword_rationale(float(score), [KEYWORDS[i] for i in np.flatnonzero(row)]))
+                for score, row in zip(scores, matches)
+            ]
+        except Exception as e:
+            logger.error(f"Bulk fallback scoring error: {e}")
+            return [self.score_job_fallback(job, resume_text) for job in jobs]
+    
     def score_job_fallback(self, job: Dict, resume_text: str) -> Tuple[float, str]:
         """
         Fallback scoring without LLM API. HARDENED: Always returns valid results.
@@ -102,35 +452,50 @@ class IntelligenceEngine:
             
             job_text = f"{title} {description} {requirements}"
             
-            # Keyword-based scoring
-            keyword_score = self.calculate_keyword_overlap(resume_text or "", job_text)
-            
-            # Extract matching keywords
-            resume_keywords = set(self.extract_keywords(resume_text or ""))
-            job_keywords = set(self.extract_keywords(job_text))
+            # One keyword pass per text feeds both the score and the matching list
+            resume_keywords, job_keywords = self._keyword_sets(resume_text or "", job_text)
+            keyword_score = _overlap_score(resume_keywords, job_keywords)
             matching = resume_keywords.intersection(job_keywords)
             
-            rationale = f"Keyword overlap score: {keyword_score:.1f}/100. "
-            
-            if matching:
-                rationale += f"Matching skills: {', '.join(list(matching)[:10])}. "
-            else:
-                rationale += "No direct skill matches found. "
-            
-            if keyword_score > 70:
-                rationale += "Strong technical alignment."
-            elif keyword_score > 40:
-                rationale += "Moderate technical alignment."
-            else:
-                rationale += "Limited technical alignment."
-            
+            rationale = _keyword_rationale(keyword_score, list(matching))
             return keyword_score, rationale
             
         except Exception as e:
             logger.error(f"Fallback scoring error: {e}")
             return 50.0, "Unable to analyze job details. Neutral score assigned."
     
-    def score_job_with_llm(self, job: Dict, resume_text: str) -> Tuple[float, str]:
+    def _score_request_body(self, job: Dict, resume_text: str) -> Dict:
+        """Build the chat completion request used to score one job."""
+        # Only the candidate and job vary; the rubric lives in the cacheable system prompt
+        prompt = f"""CANDIDATE PROFILE:
+{trim_to_tokens(resume_text, 750)}
+
+JOB POSTING:
+Title: {job.get('title', 'N/A')}
+Company: {job.get('company', 'N/A')}
+Description: {trim_to_tokens(job.get('description') or 'N/A', 500)}
+Requirements: {trim_to_tokens(job.get('requirements') or 'N/A', 250)}
+"""
+        
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": SCORE_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.2,
+            "max_tokens": 500
+        }
+    
+    def _parse_score_response(self, content: str) -> Optional[Tuple[float, str]]:
+        """Parse SCORE/RATIONALE out of an LLM reply. Returns None if malformed."""
+        score_match = SCORE_RE.search(content or '')
+        rationale_match = RATIONALE_RE.search(content or '')
+        if not (score_match and rationale_match):
+            return None
+        return min(float(score_match.group(1)), 100), rationale_match.group(1).strip()
+    
+    async def score_job_with_llm(self, job: Dict, resume_text: str) -> Tuple[float, str]:
         """
         Score job using LLM for deeper analysis. HARDENED: Always returns valid results.
         Returns: (score, rationale)
@@ -138,71 +503,38 @@ class IntelligenceEngine:
         if not self.client:
             return self.score_job_fallback(job, resume_text)
         
+        # Clearly irrelevant jobs are not worth an LLM round-trip
+        if not self._worth_llm_scoring(job, resume_text):
+            logger.info(f"Low keyword overlap for {job.get('title', 'Unknown')}, skipping LLM scoring")
+            return self.score_job_fallback(job, resume_text)
+        
         try:
-            job_text = f"""
-Title: {job.get('title', 'N/A')}
-Company: {job.get('company', 'N/A')}
-Description: {job.get('description', 'N/A')[:2000]}
-Requirements: {job.get('requirements', 'N/A')[:1000]}
-"""
-            
-            prompt = f"""You are an expert technical recruiter with deep knowledge of ML/AI and software engineering roles. Your task is to provide a precise, data-driven assessment of candidate-job fit.
-
-CANDIDATE PROFILE:
-{(resume_text or '')[:3000]}
-
-JOB POSTING:
-{job_text}
-
-ANALYSIS FRAMEWORK:
-Evaluate the following dimensions (0-100 each):
-1. Technical Skills Match: Does the candidate have the required technical stack? (programming languages, frameworks, tools)
-2. Experience Level Alignment: Does the candidate's years of experience match the seniority level? (junior: 0-2y, mid: 2-5y, senior: 5+y)
-3. Domain Expertise: Does the candidate have relevant domain experience? (e.g., NLP, computer vision, MLOps, etc.)
-4. Required vs Nice-to-Have: What percentage of "required" vs "nice-to-have" qualifications does the candidate meet?
-
-SCORING RUBRIC:
-- 90-100: Exceptional fit - Candidate exceeds most requirements
-- 75-89: Strong fit - Candidate meets all core requirements plus some preferred
-- 60-74: Good fit - Candidate meets most core requirements
-- 40-59: Moderate fit - Candidate meets some requirements, gaps exist
-- 0-39: Poor fit - Significant misalignment with requirements
-
-INSTRUCTIONS:
-1. Calculate an overall fit score (0-100) using the framework above
-2. Provide a detailed rationale with:
-   - Specific matching skills/technologies (list 3-5)
-   - Key strengths that align with the role
-   - Any notable gaps or missing qualifications
-   - Experience level assessment
-
-Format your response EXACTLY as:
-SCORE: [number between 0-100]
-RATIONALE: [Your detailed analysis - 3-4 sentences covering matches, strengths, and gaps]
-"""
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert technical recruiter specializing in ML/AI and software engineering roles. You provide precise, evidence-based candidate assessments with specific examples from their background."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=500,
-                timeout=30
-            )
+            body = self._score_request_body(job, resume_text)
+            cache_key = score_cache_key(body)
+            db = get_db()
+            cached = db.get_cached_analysis(cache_key)
+            if cached:
+                logger.info(f"LLM score cache hit: {cached[0]}/100")
+                return cached
             
-            content = response.choices[0].message.content
+            # A near-identical posting scored against the same resume gets the same score
+            embedding = await self._job_embedding(job)
+            bucket = ('score', hashlib.blake2b(resume_text.encode(), digest_size=16).digest())
+            if embedding is not None:
+                similar = get_semantic_cache().get(bucket, embedding)
+                if similar:
+                    logger.info(f"LLM score semantic cache hit: {similar[0]}/100")
+                    return similar
             
-            # Parse response
-            score_match = re.search(r'SCORE:\s*(\d+(?:\.\d+)?)', content)
-            rationale_match = re.search(r'RATIONALE:\s*(.+)', content, re.DOTALL)
+            response = await self.client.chat.completions.create(**body, timeout=30)
             
-            if score_match and rationale_match:
-                score = float(score_match.group(1))
-                rationale = rationale_match.group(1).strip()
-                logger.info(f"LLM scoring successful: {score}/100")
-                return min(score, 100), rationale
+            parsed = self._parse_score_response(response.choices[0].message.content)
+            if parsed:
+                logger.info(f"LLM scoring successful: {parsed[0]}/100")
+                db.cache_analysis(cache_key, *parsed)
+                if embedding is not None:
+                    get_semantic_cache().put(bucket, embedding, parsed)
+                return parsed
             else:
                 logger.warning("Could not parse LLM response, using fallback")
                 return self.score_job_fallback(job, resume_text)
@@ -211,26 +543,28 @@ RATIONALE: [Your detailed analysis - 3-4 sentences covering matches, strengths,
             logger.error(f"LLM scoring error: {e}")
             return self.score_job_fallback(job, resume_text)
     
-    def analyze_job(self, job_id: int, profile_id: int = 1) -> Dict:
+    async def analyze_job(self, job_id: int, profile_id: int = 1,
+                          job: Optional[Dict] = None, profile: Optional[Dict] = None) -> Dict:
         """
         Analyze a job and update database with score. HARDENED: Handles all edge cases.
+        Pass job/profile when the caller already has them to skip the lookups.
         Returns: analysis results
         """
         try:
             db = get_db()
             
             # Get job and profile with validation
-            job = db.get_job(job_id)
+            job = job or db.get_job(job_id)
             if not job:
                 raise ValueError(f"Job {job_id} not found in database")
             
-            profile = db.get_profile(profile_id)
+            profile = profile or db.get_profile(profile_id)
             if not profile:
                 raise ValueError(f"Profile {profile_id} not found in database")
             
             # Score the job
             resume_text = profile.get('resume_text', '') or profile.get('skills', '') or ''
-            score, rationale = self.score_job_with_llm(job, resume_text)
+            score, rationale = await self.score_job_with_llm(job, resume_text)
             
             # Update database
             db.update_job_analysis(job_id, score, rationale, status='analyzed')
@@ -256,25 +590,223 @@ RATIONALE: [Your detailed analysis - 3-4 sentences covering matches, strengths,
                 'rationale': f"Analysis failed: {str(e)}. Neutral score assigned."
             }
     
-    def scrape_company_website(self, company_url: str) -> str:
+    async def score_jobs_batch(self, job_ids: List[int], profile_id: int = 1,
+                         poll_interval: float = 30.0, max_wait: float = 24 * 3600) -> List[Dict]:
+        """
+        Score many jobs through the OpenAI Batch API (half price, runs off our process).
+        Polls until the batch finishes; jobs the batch does not return fall back to keyword scoring.
+        Returns: analysis results in input order
+        """
+        return await self._analyze_many(
+            job_ids, profile_id, "Batch",
+            lambda jobs, resume_text: self._run_score_batch(jobs, resume_text, poll_interval, max_wait)
+        )
+    
+    async def score_jobs_grouped(self, job_ids: List[int], profile_id: int = 1,
+                                 group_size: int = 5, concurrency: int = 4) -> List[Dict]:
+        """
+        Score many jobs now, packing group_size jobs into each chat completion.
+        The rubric and resume are sent once per group instead of once per job.
+        Returns: analysis results in input order
+        """
+        return await self._analyze_many(
+            job_ids, profile_id, "Grouped",
+            lambda jobs, resume_text: self._run_score_groups(jobs, resume_text, group_size, concurrency)
+        )
+    
+    async def _analyze_many(self, job_ids: List[int], profile_id: int, label: str,
+                            scorer: Callable[[Dict[int, Dict], str], Awaitable[Dict[int, Tuple[float, str]]]]) -> List[Dict]:
+        """Score jobs with an LLM scorer, keyword-score the rest, and store everything in one write."""
+        db = get_db()
+        profile = db.get_profile(profile_id)
+        if not profile:
+            raise ValueError(f"Profile {profile_id} not found in database")
+        resume_text = profile.get('resume_text', '') or profile.get('skills', '') or ''
+        
+        jobs = {job_id: db.get_job(job_id) for job_id in job_ids}
+        jobs = {job_id: job for job_id, job in jobs.items() if job}
+        
+        # Only jobs that pass the keyword pre-filter go to the LLM
+        candidates = {job_id: job for job_id, job in jobs.items() if self._worth_llm_scoring(job, resume_text)}
+        
+        scores = {}
+        if self.client and candidates:
+            try:
+                scores = await scorer(candidates, resume_text)
+            except Exception as e:
+                logger.error(f"{label} scoring error: {e}")
+        
+        # Whatever the LLM did not score gets keyword scores in one matrix pass
+        unscored = [job_id for job_id in jobs if job_id not in scores]
+        fallback = self.score_jobs_fallback_many([jobs[job_id] for job_id in unscored], resume_text)
+        scores.update(zip(unscored, fallback))
+        
+        updates = []
+        results = []
+        for job_id in job_ids:
+            job = jobs.get(job_id)
+            if not job:
+                results.append({
+                    'job_id': job_id,
+                    'title': 'Unknown',
+                    'company': 'Unknown',
+                    'score': 50.0,
+                    'rationale': f"Analysis failed: Job {job_id} not found in database. Neutral score assigned."
+                })
+                continue
+            score, rationale = scores[job_id]
+            updates.append((job_id, score, rationale))
+            results.append({
+                'job_id': job_id,
+                'title': job.get('title', 'Unknown'),
+                'company': job.get('company', 'Unknown'),
+                'score': score,
+                'rationale': rationale
+            })
+        
+        db.update_job_analyses_many(updates, status='analyzed')
+        logger.info(f"{label} analyzed {len(updates)} jobs ({len(jobs) - len(unscored)} scored by LLM)")
+        return results
+    
+    async def _run_score_groups(self, jobs: Dict[int, Dict], resume_text: str,
+                                group_size: int, concurrency: int) -> Dict[int, Tuple[float, str]]:
+        """Score jobs group_size at a time with structured JSON replies, keyed by job id."""
+        job_items = list(jobs.items())
+        groups = [job_items[i:i + group_size] for i in range(0, len(job_items), group_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def score_group(group: List[Tuple[int, Dict]]) -> Dict[int, Tuple[float, str]]:
+            postings = "\n".join(
+                f"""JOB {index}:
+Title: {job.get('title', 'N/A')}
+Company: {job.get('company', 'N/A')}
+Description: {trim_to_tokens(job.get('description') or 'N/A', 500)}
+Requirements: {trim_to_tokens(job.get('requirements') or 'N/A', 250)}
+"""
+                for index, (_, job) in enumerate(group)
+            )
+            prompt = f"""CANDIDATE PROFILE:
+{trim_to_tokens(resume_text, 750)}
+
+JOB POSTINGS:
+{postings}"""
+            try:
+                async with semaphore:
+                    response = await self.client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": SCORE_GROUP_SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        response_format=SCORE_GROUP_SCHEMA,
+                        temperature=0.2,
+                        max_tokens=250 * len(group),
+                        timeout=60
+                    )
+                entries = orjson.loads(response.choices[0].message.content)['scores']
+            except Exception as e:
+                logger.error(f"Grouped scoring error for {len(group)} jobs: {e}")
+                return {}
+            
+            scores = {}
+            for entry in entries:
+                index = entry['job_index']
+                if 0 <= index < len(group):
+                    scores[group[index][0]] = (min(float(entry['score']), 100), entry['rationale'].strip())
+            return scores
+        
+        scores = {}
+        for group_scores in await asyncio.gather(*map(score_group, groups)):
+            scores.update(group_scores)
+        return scores
+    
+    async def _run_score_batch(self, jobs: Dict[int, Dict], resume_text: str,
+                         poll_interval: float, max_wait: float) -> Dict[int, Tuple[float, str]]:
+        """Submit one batch of scoring requests and collect the parsed replies by job id."""
+        db = get_db()
+        scores = {}
+        cache_keys = {}
+        lines = []
+        for job_id, job in jobs.items():
+            body = self._score_request_body(job, resume_text)
+            cache_key = score_cache_key(body)
+            cached = db.get_cached_analysis(cache_key)
+            if cached:
+                scores[job_id] = cached
+                continue
+            cache_keys[job_id] = cache_key
+            lines.append(orjson.dumps({
+                "custom_id": f"job_{job_id}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+        if not lines:
+            return scores
+        
+        batch_input = await self.client.files.create(
+            file=("batch_input.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted scoring batch {batch.id} for {len(lines)} jobs")
+        
+        deadline = time.monotonic() + max_wait
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() >= deadline:
+                await self.client.batches.cancel(batch.id)
+                raise TimeoutError(f"Batch {batch.id} still {batch.status} after {max_wait:g}s")
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        
+        output = (await self.client.files.content(batch.output_file_id)).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get('response') or {}
+            if response.get('status_code') != 200:
+                continue
+            content = response['body']['choices'][0]['message']['content']
+            parsed = self._parse_score_response(content)
+            if parsed:
+                job_id = int(record['custom_id'].split('_', 1)[1])
+                scores[job_id] = parsed
+                db.cache_analysis(cache_keys[job_id], *parsed)
+        return scores
+    
+    async def scrape_company_website(self, company_url: str) -> str:
         """
         Scrape company website for context. HARDENED: Safe against failures.
         Returns: extracted text content
         """
         try:
-            response = requests.get(company_url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            # Only 5000 chars of text survive, so stop downloading after the head of the page
+            chunks = []
+            received = 0
+            async with get_http_client().stream('GET', company_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if received >= MAX_COMPANY_HTML_BYTES:
+                        break
+                html = b''.join(chunks)[:MAX_COMPANY_HTML_BYTES].decode(
+                    response.encoding or 'utf-8', errors='replace'
+                )
             
-            # Get text
-            text = soup.get_text(separator='\n', strip=True)
+            # Remove script and style elements, then take the visible text
+            tree = HTMLParser(html)
+            tree.strip_tags(['script', 'style'])
+            root = tree.body or tree.root
+            text = root.text(separator='\n', strip=True) if root else ""
             
             # Limit length
             return text[:5000]
@@ -306,50 +838,38 @@ Best regards,
             logger.error(f"Fallback cover letter generation error: {e}")
             return "Error generating cover letter. Please write manually."
     
-    def generate_cover_letter(self, job_id: int, profile_id: int = 1, 
-                            company_context: str = "") -> str:
+    async def _cover_letter_request(self, job: Dict, profile: Dict, company_context: str,
+                                    score: Optional[float]) -> Tuple[Dict, str]:
         """
-        Generate highly persuasive cover letter using advanced RAG. HARDENED.
-        Returns: cover letter text
+        Build the chat completion request for a cover letter, scraping company context if missing.
+        Returns: (request kwargs, company context used)
         """
-        try:
-            db = get_db()
-            
-            job = db.get_job(job_id)
-            profile = db.get_profile(profile_id)
-            
-            if not job or not profile:
-                raise ValueError("Job or profile not found")
-            
-            if not self.client:
-                return self.generate_cover_letter_fallback(job, profile)
-            
-            # If company context not provided, try to scrape
-            if not company_context and job.get('url'):
-                try:
-                    from urllib.parse import urlparse
-                    parsed = urlparse(job['url'])
-                    base_url = f"{parsed.scheme}://{parsed.netloc}"
-                    company_context = self.scrape_company_website(base_url)
-                except:
-                    pass
-            
-            prompt = f"""You are an expert career coach and professional writer specializing in crafting compelling, persuasive job application materials for technical roles. Your cover letters have helped candidates land positions at top tech companies.
+        # If company context not provided, try to scrape
+        if not company_context and job.get('url'):
+            try:
+                from urllib.parse import urlparse
+                parsed = urlparse(job['url'])
+                base_url = f"{parsed.scheme}://{parsed.netloc}"
+                company_context = await self.scrape_company_website(base_url)
+            except:
+                pass
+        
+        prompt = f"""You are an expert career coach and professional writer specializing in crafting compelling, persuasive job application materials for technical roles. Your cover letters have helped candidates land positions at top tech companies.
 
 CANDIDATE PROFILE:
 Name: {profile.get('name', 'The candidate')}
 Technical Skills: {(profile.get('skills', 'N/A'))[:800]}
-Professional Experience: {(profile.get('experience', 'N/A'))[:1200]}
+Professional Experience: {(profile.get('experience', 'N/A'))[:600]}
 Education: {(profile.get('education', 'N/A'))[:500]}
 
 TARGET ROLE:
 Position: {job.get('title', 'N/A')}
 Company: {job.get('company', 'N/A')}
-Job Description: {(job.get('description', 'N/A'))[:1500]}
+Job Description: {(job.get('description', 'N/A'))[:700]}
 Key Requirements: {(job.get('requirements', 'N/A'))[:800]}
 
 COMPANY INTELLIGENCE:
-{company_context[:2000] if company_context else 'Research the company values and mission independently'}
+{company_context[:800] if company_context else 'Research the company values and mission independently'}
 
 WRITING GUIDELINES:
 1. OPENING (Hook): Start with a compelling statement that shows genuine enthusiasm and immediately demonstrates understanding of the role
@@ -377,19 +897,67 @@ CRITICAL RULES:
 
 Write a high-impact cover letter that will make the hiring manager want to interview this candidate:
 """
+        
+        # Strong matches are worth the larger model; everything else gets the fast one
+        if score is None:
+            score = job.get('fit_score')
+        model = "gpt-4o" if score is not None and score >= COVER_LETTER_ESCALATION_SCORE else "gpt-4o-mini"
+        
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": "You are an elite career advisor specializing in technical roles. Your cover letters are known for being specific, achievement-focused, and highly persuasive. You avoid generic language and always include concrete examples."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.8,
+            "max_tokens": 700
+        }, company_context
+    
+    async def generate_cover_letter(self, job_id: int, profile_id: int = 1, 
+                            company_context: str = "", score: Optional[float] = None,
+                            job: Optional[Dict] = None, profile: Optional[Dict] = None) -> str:
+        """
+        Generate highly persuasive cover letter using advanced RAG. HARDENED.
+        Uses gpt-4o-mini unless the fit score (passed in or stored on the job) warrants gpt-4o.
+        Pass job/profile when the caller already has them to skip the lookups.
+        Returns: cover letter text
+        """
+        db = get_db()
+        try:
+            job = job or db.get_job(job_id)
+            profile = profile or db.get_profile(profile_id)
+        except Exception as e:
+            logger.error(f"Cover letter lookup error: {e}")
+        
+        try:
+            if not job or not profile:
+                raise ValueError("Job or profile not found")
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an elite career advisor specializing in technical roles. Your cover letters are known for being specific, achievement-focused, and highly persuasive. You avoid generic language and always include concrete examples."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                max_tokens=700,
-                timeout=60
-            )
+            if not self.client:
+                return self.generate_cover_letter_fallback(job, profile)
+            
+            # The same role at the same company posted under another job id reuses its letter;
+            # asking again for this exact job still writes a fresh one
+            embedding = await self._job_embedding(job)
+            bucket = ('cover_letter', profile_id, (job.get('company') or '').lower(), (job.get('title') or '').lower())
+            similar = get_semantic_cache().get(bucket, embedding, exclude_key=job_id) if embedding is not None else None
+            if similar:
+                cover_letter, company_context = similar
+                draft_id = db.insert_draft(
+                    job_id=job_id,
+                    profile_id=profile_id,
+                    cover_letter=cover_letter,
+                    company_context=company_context[:1000] if company_context else None
+                )
+                logger.info(f"Reused cover letter from a near-duplicate posting for job {job_id} (draft_id: {draft_id})")
+                return cover_letter
+            
+            request, company_context = await self._cover_letter_request(job, profile, company_context, score)
+            response = await self.client.chat.completions.create(**request, timeout=60)
             
             cover_letter = response.choices[0].message.content.strip()
+            if embedding is not None:
+                get_semantic_cache().put(bucket, embedding, (cover_letter, company_context), key=job_id)
             
             # Store draft in database
             draft_id = db.insert_draft(
@@ -399,31 +967,73 @@ Write a high-impact cover letter that will make the hiring manager want to inter
                 company_context=company_context[:1000] if company_context else None
             )
             
-            logger.info(f"Generated high-grade cover letter for job {job_id} (draft_id: {draft_id})")
+            logger.info(f"Generated high-grade cover letter for job {job_id} with {request['model']} (draft_id: {draft_id})")
             
             return cover_letter
             
         except Exception as e:
             logger.error(f"LLM cover letter generation error: {e}")
             # Always return fallback instead of crashing
-            db = get_db()
-            job = db.get_job(job_id)
-            profile = db.get_profile(profile_id)
             return self.generate_cover_letter_fallback(job or {}, profile or {})
     
-    def analyze_and_draft(self, job_id: int, profile_id: int = 1) -> Dict:
+    async def generate_cover_letter_stream(self, job_id: int, profile_id: int = 1,
+                                           company_context: str = "",
+                                           score: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Stream a cover letter as the model writes it; the full letter is stored as a draft at the end.
+        Yields the fallback letter in one piece when the LLM is unavailable or fails before any text.
+        """
+        db = get_db()
+        job = db.get_job(job_id)
+        profile = db.get_profile(profile_id)
+        if not job or not profile or not self.client:
+            yield self.generate_cover_letter_fallback(job or {}, profile or {})
+            return
+        
+        parts = []
+        try:
+            request, company_context = await self._cover_letter_request(job, profile, company_context, score)
+            stream = await self.client.chat.completions.create(**request, stream=True, timeout=60)
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"LLM cover letter streaming error: {e}")
+            if not parts:
+                yield self.generate_cover_letter_fallback(job, profile)
+            # A letter cut off mid-stream is not worth saving as a draft
+            return
+        
+        draft_id = db.insert_draft(
+            job_id=job_id,
+            profile_id=profile_id,
+            cover_letter=''.join(parts).strip(),
+            company_context=company_context[:1000] if company_context else None
+        )
+        logger.info(f"Streamed cover letter for job {job_id} with {request['model']} (draft_id: {draft_id})")
+    
+    async def analyze_and_draft(self, job_id: int, profile_id: int = 1) -> Dict:
         """
         Complete analysis and draft generation pipeline. HARDENED.
         Returns: combined results
         """
         try:
+            # Look up once; both steps reuse the same rows
+            db = get_db()
+            job = db.get_job(job_id)
+            profile = db.get_profile(profile_id)
+            
             # Analyze job
-            analysis = self.analyze_job(job_id, profile_id)
+            analysis = await self.analyze_job(job_id, profile_id, job=job, profile=profile)
             
             # Generate cover letter for high-scoring jobs
             if analysis['score'] >= 50:
                 try:
-                    cover_letter = self.generate_cover_letter(job_id, profile_id)
+                    cover_letter = await self.generate_cover_letter(
+                        job_id, profile_id, score=analysis['score'], job=job, profile=profile
+                    )
                     analysis['cover_letter'] = cover_letter
                 except Exception as e:
                     logger.error(f"Cover letter generation failed: {e}")
@@ -444,9 +1054,24 @@ Write a high-impact cover letter that will make the hiring manager want to inter
                 'rationale': f"Pipeline error: {str(e)}",
                 'cover_letter': None
             }
+    
+    async def analyze_and_draft_many(self, job_ids: List[int], profile_id: int = 1,
+                                     concurrency: int = 8) -> List[Dict]:
+        """
+        Run analyze_and_draft for many jobs concurrently.
+        Each job still scores before drafting; the semaphore caps in-flight jobs for rate limits.
+        Returns: one result per job, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def analyze_one(job_id: int) -> Dict:
+            async with semaphore:
+                return await self.analyze_and_draft(job_id, profile_id)
+        
+        return await asyncio.gather(*map(analyze_one, job_ids))
 
 
-def main():
+async def main():
     """Test intelligence engine."""
     engine = IntelligenceEngine()
     
@@ -455,7 +1080,7 @@ def main():
     jobs = db.get_jobs(limit=1)
     
     if jobs:
-        result = engine.analyze_and_draft(jobs[0]['id'])
+        result = await engine.analyze_and_draft(jobs[0]['id'])
         print(f"\nAnalysis Result:")
         print(f"Job: {result['title']} at {result['company']}")
         print(f"Score: {result['score']:.1f}/100")
@@ -467,4 +1092,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    install_uvloop()
+    asyncio.run(main())
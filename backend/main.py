@@ -3,11 +3,17 @@ FastAPI Backend for AutoCareer Application.
 Orchestrates all modules and provides API endpoints.
 """
 
-import os
 import asyncio
-from typing import Optional, List
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+import hashlib
+import importlib.util
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, List
+import orjson
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 from dotenv import load_dotenv
@@ -16,10 +22,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from database import get_db
-from profile_engine import ProfileEngine
+from profile_engine import get_profile_engine
 from scraper import JobScraper
-from intelligence import IntelligenceEngine
-from applier import ApplicationAutomation
+from intelligence import IntelligenceEngine, close_http_client
+from applier import ApplicationAutomation, confirm_submission, get_browser_pool
+from browser import shutdown_playwright
 
 import logging
 import sys
@@ -43,9 +50,100 @@ app.add_middleware(
 )
 
 # Initialize engines
-profile_engine = ProfileEngine()
+profile_engine = get_profile_engine()
 intelligence_engine = IntelligenceEngine()
 
+# Engines for caller-supplied API keys, most recently used last; each keeps its OpenAI
+# client (and connection pool) alive across requests
+ENGINE_POOL_SIZE = 16
+_engine_pool: OrderedDict = OrderedDict()
+# An evicted engine's client is closed this long after eviction, so requests and streams
+# that already hold it can finish. Pending closes (task -> engine) are kept referenced here
+ENGINE_CLOSE_GRACE = 120.0
+_retired_engines: Dict[asyncio.Task, IntelligenceEngine] = {}
+
+
+async def _close_retired_engine(engine: IntelligenceEngine):
+    """Close an evicted engine's OpenAI client once its grace period has passed."""
+    try:
+        await asyncio.sleep(ENGINE_CLOSE_GRACE)
+        if engine.client:
+            await engine.client.close()
+    except Exception as e:
+        logger.warning(f"Failed to close evicted engine client: {e}")
+    finally:
+        _retired_engines.pop(asyncio.current_task(), None)
+
+
+def get_engine(api_key: Optional[str] = None) -> IntelligenceEngine:
+    """Default engine, or the pooled engine for a caller-supplied API key."""
+    if not api_key:
+        return intelligence_engine
+    engine = _engine_pool.get(api_key)
+    if engine is not None:
+        _engine_pool.move_to_end(api_key)
+        return engine
+    
+    engine = _engine_pool[api_key] = IntelligenceEngine(api_key=api_key)
+    if len(_engine_pool) > ENGINE_POOL_SIZE:
+        _, evicted = _engine_pool.popitem(last=False)
+        _retired_engines[asyncio.create_task(_close_retired_engine(evicted))] = evicted
+    return engine
+
+
+# Serialized bodies of polled GET endpoints: key -> (data version, built at, body, etag).
+# Reused while the local data version holds. Versions only see this worker's writes; another
+# worker's shows up once the TTL lapses and build() reads through (get_jobs queries SQLite,
+# get_profile's row cache expires after 5s too), so within about twice the TTL.
+RESPONSE_CACHE_SIZE = 64
+RESPONSE_CACHE_TTL = 5.0
+_response_cache: OrderedDict = OrderedDict()
+
+
+def cached_json_response(request: Request, key: Hashable, version: int, build: Callable[[], Dict]) -> Response:
+    """
+    JSON response with a content-hash ETag; answers 304 when the client already has it.
+    Returns: the cached body while version is unchanged and younger than RESPONSE_CACHE_TTL
+    """
+    now = time.monotonic()
+    cached = _response_cache.get(key)
+    if cached is None or cached[0] != version or now - cached[1] >= RESPONSE_CACHE_TTL:
+        body = orjson.dumps(build())
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        cached = _response_cache[key] = (version, now, body, etag)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    _response_cache.move_to_end(key)
+    
+    _, _, body, etag = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.on_event("startup")
+async def start_background_writers():
+    """Start batching application log writes and query embeddings off the request path."""
+    get_db().start_log_writer()
+    profile_engine.start_encode_batcher()
+
+
+@app.on_event("shutdown")
+async def shutdown_shared_resources():
+    """Close shared browsers, HTTP clients and the log writer on server shutdown."""
+    await get_browser_pool().shutdown()
+    await shutdown_playwright()
+    await close_http_client()
+    for task in _retired_engines:
+        task.cancel()
+    for engine in [intelligence_engine, *_engine_pool.values(), *_retired_engines.values()]:
+        if engine.client:
+            await engine.client.close()
+    _engine_pool.clear()
+    _retired_engines.clear()
+    await profile_engine.stop_encode_batcher()
+    await get_db().stop_log_writer()
+
 
 # Request/Response Models
 class SearchJobsRequest(BaseModel):
@@ -75,6 +173,8 @@ class SubmitApplicationRequest(BaseModel):
     profile_id: int = 1
     draft_id: Optional[int] = None
     dry_run: bool = True
+    # Live submissions wait for POST /confirm-submission/{job_id} unless this is turned off
+    require_confirm: bool = True
 
 
 # API Endpoints
@@ -96,23 +196,15 @@ async def upload_resume(file: UploadFile = File(...), profile_id: Optional[int]
     Returns: profile_id and parsing results
     """
     try:
-        # Save uploaded file temporarily
-        temp_path = f"./backend/data/temp_resume_{profile_id or 'new'}.pdf"
-        os.makedirs(os.path.dirname(temp_path), exist_ok=True)
+        # Parse straight from memory; no temp file to write, read back and clean up
+        content = await file.read()
         
-        with open(temp_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Parse and ingest
-        profile_id, vector_db_id = profile_engine.ingest_resume(temp_path, profile_id)
+        # Parse and ingest (PDF parsing and embedding are CPU-bound; keep them off the event loop)
+        profile_id, vector_db_id = await asyncio.to_thread(profile_engine.ingest_resume, content, profile_id)
         
         # Get profile details
         db = get_db()
-        profile = db.get_profile(profile_id)
-        
-        # Clean up temp file
-        os.remove(temp_path)
+        profile = await asyncio.to_thread(db.get_profile, profile_id)
         
         logger.info(f"Resume uploaded and parsed for profile {profile_id}")
         
@@ -153,22 +245,24 @@ async def search_jobs(request: SearchJobsRequest, background_tasks: BackgroundTa
         
         logger.info(f"Job search completed: {len(jobs)} jobs found")
         
-        return {
+        # List-heavy endpoints return ORJSONResponse: their plain SQLite rows skip
+        # jsonable_encoder and orjson encodes them several times faster than stdlib json
+        return ORJSONResponse({
             "success": True,
             "count": len(jobs),
             "jobs": [
                 {
-                    "id": job.get('id'),
+                    "id": job['id'],
                     "title": job['title'],
                     "company": job['company'],
-                    "location": job.get('location'),
+                    "location": job['location'],
                     "url": job['url'],
                     "source": job['source'],
-                    "fit_score": job.get('fit_score')
+                    "fit_score": job['fit_score']
                 }
                 for job in jobs
             ]
-        }
+        })
         
     except Exception as e:
         logger.error(f"Job search error: {e}")
@@ -183,8 +277,8 @@ async def analyze_job(job_id: int, request: AnalyzeJobRequest):
     """
     try:
         # Use provided API key or fall back to engine's default
-        engine = IntelligenceEngine(api_key=request.api_key) if request.api_key else intelligence_engine
-        result = engine.analyze_job(job_id, request.profile_id)
+        engine = get_engine(request.api_key)
+        result = await engine.analyze_job(job_id, request.profile_id)
         
         logger.info(f"Job {job_id} analyzed: score {result['score']:.1f}")
         
@@ -206,8 +300,8 @@ async def generate_draft(job_id: int, request: GenerateDraftRequest):
     """
     try:
         # Use provided API key or fall back to engine's default
-        engine = IntelligenceEngine(api_key=request.api_key) if request.api_key else intelligence_engine
-        cover_letter = engine.generate_cover_letter(
+        engine = get_engine(request.api_key)
+        cover_letter = await engine.generate_cover_letter(
             job_id, 
             request.profile_id
         )
@@ -229,6 +323,19 @@ async def generate_draft(job_id: int, request: GenerateDraftRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/generate-draft/{job_id}/stream")
+async def generate_draft_stream(job_id: int, request: GenerateDraftRequest):
+    """
+    Stream a cover letter draft as plain text while it is generated.
+    Returns: text/plain stream; the finished letter is saved as a draft
+    """
+    engine = get_engine(request.api_key)
+    return StreamingResponse(
+        engine.generate_cover_letter_stream(job_id, request.profile_id),
+        media_type="text/plain"
+    )
+
+
 @app.put("/draft/{draft_id}")
 async def update_draft(draft_id: int, request: UpdateDraftRequest):
     """
@@ -266,11 +373,11 @@ async def manage_queue(status: str = "pending"):
         db = get_db()
         queue_items = db.get_queue(status=status)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "count": len(queue_items),
             "queue": queue_items
-        }
+        })
         
     except Exception as e:
         logger.error(f"Queue management error: {e}")
@@ -284,7 +391,10 @@ async def submit_application(job_id: int, request: SubmitApplicationRequest):
     Returns: submission status
     """
     try:
-        applier = ApplicationAutomation(dry_run=request.dry_run)
+        applier = ApplicationAutomation(
+            dry_run=request.dry_run,
+            require_manual_confirm=request.require_confirm
+        )
         result = await applier.apply_to_job(
             job_id=job_id,
             profile_id=request.profile_id,
@@ -303,26 +413,43 @@ async def submit_application(job_id: int, request: SubmitApplicationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/confirm-submission/{job_id}")
+async def confirm_pending_submission(job_id: int):
+    """
+    Approve a live submission waiting for manual confirmation.
+    Returns: whether a waiting submission was released
+    """
+    if not confirm_submission(job_id):
+        raise HTTPException(status_code=404, detail="No submission awaiting confirmation for this job")
+    
+    logger.info(f"Submission confirmed for job {job_id}")
+    return {"success": True, "job_id": job_id}
+
+
 @app.get("/jobs")
-async def get_jobs(status: Optional[str] = None, limit: int = 50):
+async def get_jobs(request: Request, status: Optional[str] = None, limit: int = 50):
     """
     Get stored jobs with optional filtering.
-    Returns: list of jobs with properly serialized URLs
+    Returns: list of jobs with properly serialized URLs (ETag-validated)
     """
     try:
         db = get_db()
-        jobs = db.get_jobs(status=status, limit=limit)
         
-        # Ensure all jobs have valid URLs
-        for job in jobs:
-            if not job.get('url'):
-                job['url'] = '#'  # Fallback for missing URLs
+        def build() -> Dict:
+            jobs = db.get_jobs(status=status, limit=limit)
+            
+            # Ensure all jobs have valid URLs
+            for job in jobs:
+                if not job.get('url'):
+                    job['url'] = '#'  # Fallback for missing URLs
+            
+            return {
+                "success": True,
+                "count": len(jobs),
+                "jobs": jobs
+            }
         
-        return {
-            "success": True,
-            "count": len(jobs),
-            "jobs": jobs
-        }
+        return cached_json_response(request, ("jobs", status, limit), db.jobs_version, build)
         
     except Exception as e:
         logger.error(f"Get jobs error: {e}")
@@ -339,11 +466,11 @@ async def get_application_logs(limit: int = 100):
         db = get_db()
         logs = db.get_application_logs(limit=limit)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "count": len(logs),
             "logs": logs
-        }
+        })
         
     except Exception as e:
         logger.error(f"Get logs error: {e}")
@@ -351,22 +478,24 @@ async def get_application_logs(limit: int = 100):
 
 
 @app.get("/profile/{profile_id}")
-async def get_profile(profile_id: int = 1):
+async def get_profile(request: Request, profile_id: int = 1):
     """
     Get user profile details.
-    Returns: profile information
+    Returns: profile information (ETag-validated)
     """
     try:
         db = get_db()
-        profile = db.get_profile(profile_id)
         
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
+        def build() -> Dict:
+            profile = db.get_profile(profile_id)
+            if not profile:
+                raise HTTPException(status_code=404, detail="Profile not found")
+            return {
+                "success": True,
+                "profile": profile
+            }
         
-        return {
-            "success": True,
-            "profile": profile
-        }
+        return cached_json_response(request, ("profile", profile_id), db.profiles_version, build)
         
     except HTTPException:
         raise
@@ -376,5 +505,16 @@ async def get_profile(profile_id: int = 1):
 
 
 if __name__ == "__main__":
-    logger.info("Starting AutoCareer API server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Each worker is a separate process with its own browsers, caches and pending submit
+    # confirmations, so more than one is opt-in via WEB_CONCURRENCY
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    logger.info(f"Starting AutoCareer API server with {workers} worker(s)...")
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        # uvloop and httptools ship with uvicorn[standard]; uvloop is not available on Windows
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools"
+    )
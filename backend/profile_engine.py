@@ -3,45 +3,325 @@ Profile Ingestion Engine for AutoCareer.
 Parses resumes, extracts information, and creates vector embeddings.
 """
 
+import asyncio
+import bisect
+import contextlib
+import hashlib
 import os
 import re
-from typing import Dict, List, Optional, Tuple
-import pdfplumber
-from sentence_transformers import SentenceTransformer
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple, Union
+import pypdfium2 as pdfium
 import numpy as np
+import orjson
 import pickle
+import faiss
 from database import get_db
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, run a single worker
+    fcntl = None
+
+# HNSW graph parameters: links per node, and candidate list sizes while building and searching
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Stores up to this many chunks are searched exactly with one matrix-vector product,
+# which beats walking the HNSW graph at this size
+EXACT_SEARCH_MAX_VECTORS = 4096
+
+# Query embeddings kept per engine, most recently used last; longer queries are not cached
+QUERY_CACHE_SIZE = 2048
+QUERY_CACHE_MAX_CHARS = 4096
+
+
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+LINK_RE = re.compile(r'(https?://[^\s]+|www\.[^\s]+|github\.com/[^\s]+|linkedin\.com/in/[^\s]+)', re.IGNORECASE)
+
+WORD_RE = re.compile(r'\S+')
+
+SECTION_HEADERS = (
+    'technical skills', 'skills', 'core competencies', 'work experience', 'experience',
+    'employment', 'education', 'projects', 'certifications'
+)
+# Zero-width lookahead reports every header at every offset, overlapping ones included,
+# so one scan yields what str.find would for each header
+SECTION_HEADER_RE = re.compile('(?=(' + '|'.join(map(re.escape, SECTION_HEADERS)) + '))')
+
+try:
+    import ahocorasick
+
+    # Aho-Corasick automaton over the headers: one linear pass however many headers there are
+    _HEADER_AUTOMATON = ahocorasick.Automaton()
+    for _header in SECTION_HEADERS:
+        _HEADER_AUTOMATON.add_word(_header, _header)
+    _HEADER_AUTOMATON.make_automaton()
+except ImportError:
+    # pyahocorasick is optional; the regex scan finds the same offsets
+    _HEADER_AUTOMATON = None
+
+
+def _header_offsets(text_lower: str) -> Dict[str, List[int]]:
+    """Offsets of every section header in one pass, ascending per header."""
+    offsets = {header: [] for header in SECTION_HEADERS}
+    if _HEADER_AUTOMATON is not None:
+        # Matches are reported by end offset, which orders them by start within a header
+        for end, header in _HEADER_AUTOMATON.iter(text_lower):
+            offsets[header].append(end - len(header) + 1)
+        return offsets
+    for match in SECTION_HEADER_RE.finditer(text_lower):
+        offsets[match.group(1)].append(match.start())
+    return offsets
+
+
+def _find_header(offsets: Dict[str, List[int]], header: str, start: int = 0) -> int:
+    """str.find over precomputed header offsets: first offset >= start, or -1."""
+    positions = offsets[header]
+    i = bisect.bisect_left(positions, start)
+    return positions[i] if i < len(positions) else -1
+
+
+# A new chunk this similar to one the profile already has is a minor edit and replaces it
+NEAR_DUPLICATE_SIMILARITY = 0.98
+
+# Output size of known models, so the store can be opened without loading the model
+MODEL_DIMENSIONS = {"all-MiniLM-L6-v2": 384}
+
+
+def _chunk_hash(text: str) -> bytes:
+    """Content hash identifying an exact duplicate chunk."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so inner product equals cosine similarity."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
 
 class ProfileEngine:
     """Resume parser and vector embedding generator."""
     
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        """Initialize with sentence transformer model."""
-        self.model = SentenceTransformer(model_name)
-        self.vector_store_path = "./backend/data/vectors.pkl"
-        self.vectors = self._load_vectors()
-        
-    def _load_vectors(self) -> Dict:
-        """Load existing vector store or create new one."""
-        if os.path.exists(self.vector_store_path):
-            with open(self.vector_store_path, 'rb') as f:
-                return pickle.load(f)
-        return {"embeddings": [], "metadata": [], "texts": []}
-    
-    def _save_vectors(self):
-        """Save vector store to disk."""
-        os.makedirs(os.path.dirname(self.vector_store_path), exist_ok=True)
-        with open(self.vector_store_path, 'wb') as f:
-            pickle.dump(self.vectors, f)
-    
-    def parse_pdf(self, pdf_path: str) -> str:
-        """Extract text from PDF resume."""
-        text = ""
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
+        """Initialize; the sentence transformer model is loaded on first use."""
+        self.model_name = model_name
+        self._model = None
+        self._model_lock = threading.Lock()
+        # Unit-length float16 embeddings as raw rows, plus one JSON line of text/metadata per row
+        self.embeddings_path = "./backend/data/embeddings.f16"
+        self.chunks_path = "./backend/data/chunks.jsonl"
+        self.legacy_store_path = "./backend/data/vectors.pkl"
+        self.index_path = "./backend/data/vectors.hnsw"
+        # Held while writing the store, so uvicorn workers sharing it don't interleave appends
+        self.lock_path = "./backend/data/vectors.lock"
+        self.vectors = {"metadata": [], "texts": []}
+        # Bytes of chunks_path read so far; rows other workers append past it are picked up by _sync
+        self._chunks_offset = 0
+        # Row lookups for dedup: (profile_id, chunk hash) -> row, profile_id -> rows
+        self._chunk_rows: Dict[Tuple[Optional[int], bytes], int] = {}
+        self._profile_rows: Dict[Optional[int], List[int]] = {}
+        # Rows superseded by an edited version of the same chunk; kept on disk, never returned by search
+        self._deleted: Set[int] = set()
+        self._search_params = None
+        with self._file_lock():
+            self._load_vectors()
+            # Read-only memory map over embeddings_path, one row per chunk
+            self._matrix = self._load_matrix()
+            self.index = self._load_index()
+        # Background query-encoding batcher state (see start_encode_batcher)
+        self._encode_queue: Optional[asyncio.Queue] = None
+        self._encode_batcher_task: Optional[asyncio.Task] = None
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # Serializes appends to the store, index and matrix when uploads run in worker threads
+        self._store_lock = threading.Lock()
+        
+    @property
+    def model(self):
+        """The SentenceTransformer model, loaded (with torch) on first access."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    import torch
+                    from sentence_transformers import SentenceTransformer
+                    # Split cores between uvicorn workers instead of each claiming all of them
+                    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+                    if workers > 1:
+                        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+                    model = SentenceTransformer(self.model_name)
+                    # Half precision halves encoder bandwidth on GPU; CPU kernels stay float32
+                    if model.device.type == "cuda":
+                        model.half()
+                    self._model = model
+        return self._model
+    
+    @property
+    def embedding_dim(self) -> int:
+        """Embedding size, without loading the model when it is a known one."""
+        return MODEL_DIMENSIONS.get(self.model_name) or self.model.get_sentence_embedding_dimension()
+    
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the store across processes; a no-op where fcntl is unavailable."""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        with open(self.lock_path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _load_vectors(self):
+        """Load chunk texts and metadata, migrating a legacy pickle store on first run."""
+        if not os.path.exists(self.chunks_path) and os.path.exists(self.legacy_store_path):
+            self._migrate_legacy_store()
+        self._read_chunks()
+    
+    def _read_chunks(self) -> int:
+        """
+        Read chunk lines appended since the last read into self.vectors.
+        Only complete lines are consumed, so a concurrent append is never half-read.
+        Returns: index of the first new row
+        """
+        start = len(self.vectors["texts"])
+        if not os.path.exists(self.chunks_path):
+            return start
+        with open(self.chunks_path, 'rb') as f:
+            f.seek(self._chunks_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        replaced = []
+        for line in data[:end].splitlines():
+            chunk = orjson.loads(line)
+            self.vectors["texts"].append(chunk["text"])
+            self.vectors["metadata"].append(chunk["metadata"])
+            if chunk.get("replaces") is not None:
+                replaced.append(chunk["replaces"])
+        self._chunks_offset += end
+        self._register_chunks(start)
+        for row in replaced:
+            self._tombstone(row)
+        return start
+    
+    def _tombstone(self, row: int):
+        """Hide a superseded row from search and the dedup lookups."""
+        if row in self._deleted:
+            return
+        self._deleted.add(row)
+        self._search_params = None
+        profile_id = self.vectors["metadata"][row].get("profile_id")
+        key = (profile_id, _chunk_hash(self.vectors["texts"][row]))
+        if self._chunk_rows.get(key) == row:
+            del self._chunk_rows[key]
+        self._profile_rows[profile_id].remove(row)
+    
+    def _sync(self):
+        """Pick up chunks other workers have stored since this process last looked."""
+        try:
+            if os.path.getsize(self.chunks_path) == self._chunks_offset:
+                return
+        except OSError:
+            return
+        with self._store_lock:
+            self._sync_locked()
+    
+    def _sync_locked(self):
+        """_sync body; the caller holds _store_lock."""
+        start = self._read_chunks()
+        if len(self.vectors["texts"]) > start:
+            self._matrix = self._load_matrix()
+            # HNSW ids are assigned in insertion order, matching positions in the store
+            self.index.add(self._matrix[start:].astype(np.float32))
+    
+    def _register_chunks(self, start: int):
+        """Add store rows from start onwards to the dedup lookups."""
+        for row in range(start, len(self.vectors["texts"])):
+            profile_id = self.vectors["metadata"][row].get("profile_id")
+            self._chunk_rows[(profile_id, _chunk_hash(self.vectors["texts"][row]))] = row
+            self._profile_rows.setdefault(profile_id, []).append(row)
+    
+    def _migrate_legacy_store(self):
+        """Convert vectors.pkl into the embeddings/chunks files."""
+        with open(self.legacy_store_path, 'rb') as f:
+            legacy = pickle.load(f)
+        if legacy["embeddings"]:
+            self._append_chunks(
+                _normalize(np.array(legacy["embeddings"])).astype(np.float16),
+                legacy["texts"],
+                legacy["metadata"]
+            )
+    
+    def _append_chunks(self, embeddings: np.ndarray, texts: List[str], metadata: List[Dict],
+                       replaces: Optional[List[Optional[int]]] = None):
+        """
+        Append embedding rows and their text/metadata lines; existing data is never rewritten.
+        replaces gives, per chunk, the row it supersedes (or None); that row is tombstoned on read.
+        """
+        os.makedirs(os.path.dirname(self.embeddings_path), exist_ok=True)
+        with open(self.embeddings_path, 'ab') as f:
+            # Drop rows left by an append that died before writing its chunk lines
+            f.truncate(len(self.vectors["texts"]) * self.embedding_dim * 2)
+            f.write(np.ascontiguousarray(embeddings, dtype=np.float16).tobytes())
+        with open(self.chunks_path, 'ab') as f:
+            f.writelines(
+                orjson.dumps(
+                    {"text": text, "metadata": meta}
+                    if replaced is None else
+                    {"text": text, "metadata": meta, "replaces": replaced}
+                ) + b"\n"
+                for text, meta, replaced in zip(texts, metadata, replaces or [None] * len(texts))
+            )
+    
+    def _load_matrix(self) -> np.ndarray:
+        """Memory-map the stored embeddings; the OS page cache shares them between processes."""
+        dim = self.embedding_dim
+        if not self.vectors["texts"]:
+            return np.empty((0, dim), dtype=np.float16)
+        return np.memmap(self.embeddings_path, dtype=np.float16, mode='r', shape=(len(self.vectors["texts"]), dim))
+    
+    def _new_index(self) -> faiss.Index:
+        """Create an empty HNSW index over fp16-encoded unit vectors (inner product = cosine)."""
+        index = faiss.IndexHNSWSQ(
+            self.embedding_dim, faiss.ScalarQuantizer.QT_fp16, HNSW_M, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+    
+    def _load_index(self) -> faiss.Index:
+        """Load the saved HNSW index, rebuilding it if missing or out of sync with the vector store."""
+        if os.path.exists(self.index_path):
+            index = faiss.read_index(self.index_path)
+            if index.ntotal == len(self._matrix):
+                index.hnsw.efSearch = HNSW_EF_SEARCH
+                return index
+        index = self._new_index()
+        if len(self._matrix):
+            index.add(self._matrix.astype(np.float32))
+        return index
+    
+    def _save_index(self):
+        """Save the HNSW index to disk."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        faiss.write_index(self.index, self.index_path)
+    
+    def parse_pdf(self, pdf: Union[str, bytes]) -> str:
+        """Extract text from a PDF resume given its path or raw bytes, one page per line block."""
+        pdf = pdfium.PdfDocument(pdf)
+        try:
+            # PDFium ends lines with \r\n; keep plain \n like the rest of the pipeline expects
+            parts = [page.get_textpage().get_text_bounded().replace("\r\n", "\n") for page in pdf]
+        finally:
+            pdf.close()
+        return "\n".join(part for part in parts if part)
     
     def extract_sections(self, text: str) -> Dict[str, str]:
         """
@@ -59,12 +339,12 @@ class ProfileEngine:
         }
         
         # Extract email
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+        email_match = EMAIL_RE.search(text)
         if email_match:
             sections["email"] = email_match.group(0)
         
         # Extract phone
-        phone_match = re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+        phone_match = PHONE_RE.search(text)
         if phone_match:
             sections["phone"] = phone_match.group(0)
         
@@ -77,47 +357,48 @@ class ProfileEngine:
                 break
         
         # Extract links (GitHub, LinkedIn, portfolio)
-        links = re.findall(r'(https?://[^\s]+|www\.[^\s]+|github\.com/[^\s]+|linkedin\.com/in/[^\s]+)', text, re.IGNORECASE)
+        links = LINK_RE.findall(text)
         sections["links"] = ", ".join(links) if links else ""
         
         # Section keywords
         text_lower = text.lower()
+        offsets = _header_offsets(text_lower)
         
         # Extract skills
         skills_start = max(
-            text_lower.find('skills'),
-            text_lower.find('technical skills'),
-            text_lower.find('core competencies')
+            _find_header(offsets, 'skills'),
+            _find_header(offsets, 'technical skills'),
+            _find_header(offsets, 'core competencies')
         )
         if skills_start != -1:
             skills_end = min(
-                text_lower.find('experience', skills_start),
-                text_lower.find('education', skills_start),
-                text_lower.find('projects', skills_start),
+                _find_header(offsets, 'experience', skills_start),
+                _find_header(offsets, 'education', skills_start),
+                _find_header(offsets, 'projects', skills_start),
                 len(text)
             )
             sections["skills"] = text[skills_start:skills_end].strip()
         
         # Extract experience
         exp_start = max(
-            text_lower.find('experience'),
-            text_lower.find('work experience'),
-            text_lower.find('employment')
+            _find_header(offsets, 'experience'),
+            _find_header(offsets, 'work experience'),
+            _find_header(offsets, 'employment')
         )
         if exp_start != -1:
             exp_end = min(
-                text_lower.find('education', exp_start),
-                text_lower.find('projects', exp_start),
+                _find_header(offsets, 'education', exp_start),
+                _find_header(offsets, 'projects', exp_start),
                 len(text)
             )
             sections["experience"] = text[exp_start:exp_end].strip()
         
         # Extract education
-        edu_start = text_lower.find('education')
+        edu_start = _find_header(offsets, 'education')
         if edu_start != -1:
             edu_end = min(
-                text_lower.find('certifications', edu_start),
-                text_lower.find('projects', edu_start),
+                _find_header(offsets, 'certifications', edu_start),
+                _find_header(offsets, 'projects', edu_start),
                 len(text)
             )
             sections["education"] = text[edu_start:edu_end].strip()
@@ -126,55 +407,42 @@ class ProfileEngine:
     
     def chunk_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
         """Split text into overlapping chunks for embedding."""
-        words = text.split()
+        # Word offsets found once; each chunk is one slice of the original text
+        bounds = [match.span() for match in WORD_RE.finditer(text)]
         chunks = []
         
-        for i in range(0, len(words), chunk_size - overlap):
-            chunk = ' '.join(words[i:i + chunk_size])
-            if chunk:
-                chunks.append(chunk)
+        for i in range(0, len(bounds), chunk_size - overlap):
+            last = min(i + chunk_size, len(bounds)) - 1
+            chunks.append(text[bounds[i][0]:bounds[last][1]])
         
         return chunks
     
-    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings for text chunks."""
-        embeddings = self.model.encode(texts, show_progress_bar=False)
-        return embeddings
+    def generate_embeddings(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Generate unit-length embeddings for text chunks; a typical resume fits in one batch."""
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
     
-    def ingest_resume(self, pdf_path: str, profile_id: Optional[int] = None) -> Tuple[int, str]:
+    def ingest_resume(self, pdf: Union[str, bytes], profile_id: Optional[int] = None) -> Tuple[int, str]:
         """
-        Complete resume ingestion pipeline.
+        Complete resume ingestion pipeline for a PDF path or in-memory PDF bytes.
         Returns: (profile_id, vector_db_id)
         """
         db = get_db()
         
         # Parse PDF
-        full_text = self.parse_pdf(pdf_path)
+        full_text = self.parse_pdf(pdf)
         
         # Extract sections
         sections = self.extract_sections(full_text)
         
-        # Chunk text for embeddings
-        chunks = self.chunk_text(full_text)
-        
-        # Generate embeddings
-        embeddings = self.generate_embeddings(chunks)
-        
-        # Store in vector database
         vector_db_id = f"profile_{profile_id or 'default'}"
         
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            self.vectors["embeddings"].append(embedding)
-            self.vectors["texts"].append(chunk)
-            self.vectors["metadata"].append({
-                "profile_id": profile_id,
-                "chunk_id": i,
-                "type": "resume_chunk"
-            })
-        
-        self._save_vectors()
-        
-        # Store in database
+        # Store in database first, so a new profile's chunks are stored under its id
         if not profile_id:
             profile_id = db.insert_profile(
                 name=sections["name"] or "Unknown",
@@ -188,39 +456,224 @@ class ProfileEngine:
             )
         else:
             # Update existing profile
-            db.cursor.execute("""
-                UPDATE profiles 
-                SET resume_text = ?, skills = ?, experience = ?, education = ?, 
-                    links = ?, vector_db_id = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (full_text, sections["skills"], sections["experience"], 
-                  sections["education"], sections["links"], vector_db_id, profile_id))
-            db.conn.commit()
+            db.update_profile_resume(
+                profile_id,
+                resume_text=full_text,
+                skills=sections["skills"],
+                experience=sections["experience"],
+                education=sections["education"],
+                links=sections["links"],
+                vector_db_id=vector_db_id
+            )
+        
+        # Chunk text and store embeddings in vector database
+        self._store_chunks(profile_id, self.chunk_text(full_text))
         
         return profile_id, vector_db_id
     
+    def _store_chunks(self, profile_id: int, chunks: List[str]):
+        """Embed and append a profile's chunks, skipping exact duplicates and replacing minor edits."""
+        # Exact duplicates (e.g. a re-upload) are neither encoded nor stored again
+        new_chunks = []
+        seen = set()
+        for i, chunk in enumerate(chunks):
+            key = (profile_id, _chunk_hash(chunk))
+            if key not in self._chunk_rows and key not in seen:
+                seen.add(key)
+                new_chunks.append((i, chunk))
+        if not new_chunks:
+            return
+        
+        # Generate unit-length embeddings so search is a plain inner product,
+        # stored as float16 to halve memory and bytes scanned per query
+        embeddings = self.generate_embeddings([chunk for _, chunk in new_chunks]).astype(np.float16)
+        
+        with self._store_lock, self._file_lock():
+            # Rows other workers stored come first, and count for the duplicate checks below
+            self._sync_locked()
+            keep = np.array([(profile_id, _chunk_hash(chunk)) not in self._chunk_rows for _, chunk in new_chunks])
+            new_chunks = [item for item, kept in zip(new_chunks, keep) if kept]
+            embeddings = embeddings[keep]
+            if not new_chunks:
+                return
+            # A near duplicate is a minor edit (a changed date or title) of one of this profile's
+            # chunks: the new text is stored and replaces the closest old row
+            replaces = [None] * len(new_chunks)
+            rows = self._profile_rows.get(profile_id)
+            if rows:
+                similarity = embeddings.astype(np.float32) @ self._matrix[rows].astype(np.float32).T
+                closest = similarity.argmax(axis=1)
+                replaces = [
+                    rows[j] if similarity[i, j] >= NEAR_DUPLICATE_SIMILARITY else None
+                    for i, j in enumerate(closest)
+                ]
+            
+            texts = [chunk for _, chunk in new_chunks]
+            metadata = [
+                {
+                    "profile_id": profile_id,
+                    "chunk_id": i,
+                    "type": "resume_chunk"
+                }
+                for i, _ in new_chunks
+            ]
+            self._append_chunks(embeddings, texts, metadata, replaces)
+            # Read back like any other worker's rows: store, lookups, matrix and index stay in step
+            self._sync_locked()
+            self._save_index()
+    
+    async def encode_async(self, text: str) -> np.ndarray:
+        """
+        Embed one text, sharing a forward pass with other queued requests.
+        Encodes directly in a worker thread when no batcher is running (e.g. CLI usage).
+        """
+        if self._encode_queue is None:
+            return (await asyncio.to_thread(self.generate_embeddings, [text]))[0]
+        future = asyncio.get_running_loop().create_future()
+        self._encode_queue.put_nowait((text, future))
+        return await future
+    
+    def start_encode_batcher(self, max_batch_size: int = 32, max_wait: float = 0.01):
+        """Start the background task that coalesces encode_async calls into batches."""
+        if self._encode_batcher_task is None:
+            self._encode_queue = asyncio.Queue()
+            self._encode_batcher_task = asyncio.create_task(self._encode_batcher(max_batch_size, max_wait))
+    
+    async def _encode_batcher(self, max_batch_size: int, max_wait: float):
+        """Encode up to max_batch_size queued texts (or max_wait seconds' worth) per forward pass."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._encode_queue.get()]
+            deadline = loop.time() + max_wait
+            while len(pending) < max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._encode_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            texts = [text for text, _ in pending]
+            try:
+                embeddings = await asyncio.to_thread(self.generate_embeddings, texts, len(texts))
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(pending, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+    
+    async def stop_encode_batcher(self):
+        """Stop the batcher; queued requests are encoded directly."""
+        if self._encode_batcher_task is not None:
+            self._encode_batcher_task.cancel()
+            try:
+                await self._encode_batcher_task
+            except asyncio.CancelledError:
+                pass
+            self._encode_batcher_task = None
+        queue, self._encode_queue = self._encode_queue, None
+        while queue is not None and not queue.empty():
+            text, future = queue.get_nowait()
+            if not future.done():
+                future.set_result(await self.encode_async(text))
+    
+    def _get_query_embedding(self, query: str) -> Optional[np.ndarray]:
+        """Cached embedding for a query, if any."""
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(query)
+            if embedding is not None:
+                self._query_cache.move_to_end(query)
+            return embedding
+    
+    def _put_query_embedding(self, query: str, embedding: np.ndarray) -> np.ndarray:
+        """Remember a query embedding (read-only, shared between callers) and return it."""
+        if len(query) > QUERY_CACHE_MAX_CHARS:
+            return embedding
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._query_cache_lock:
+            self._query_cache[query] = embedding
+            self._query_cache.move_to_end(query)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return embedding
+    
     def search_similar(self, query: str, top_k: int = 5) -> List[Dict]:
         """Search for similar content in vector store."""
-        if not self.vectors["embeddings"]:
+        self._sync()
+        if not len(self._matrix):
+            return []
+        embedding = self._get_query_embedding(query)
+        if embedding is None:
+            embedding = self._put_query_embedding(query, self.generate_embeddings([query])[0])
+        return self._search(embedding[None, :], top_k)
+    
+    async def search_similar_async(self, query: str, top_k: int = 5) -> List[Dict]:
+        """search_similar for async callers; the query is embedded through the encode batcher."""
+        self._sync()
+        if not len(self._matrix):
+            return []
+        embedding = self._get_query_embedding(query)
+        if embedding is None:
+            embedding = self._put_query_embedding(query, await self.encode_async(query))
+        return self._search(embedding[None, :], top_k)
+    
+    def _get_search_params(self) -> Optional[faiss.SearchParametersHNSW]:
+        """HNSW search parameters excluding tombstoned rows; None when nothing is deleted."""
+        if not self._deleted:
+            return None
+        if self._search_params is None:
+            deleted = np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted))
+            selector = faiss.IDSelectorNot(faiss.IDSelectorBatch(deleted))
+            # The selector holds raw pointers; keep the wrapped selectors alive alongside the params
+            self._search_params = faiss.SearchParametersHNSW(sel=selector, efSearch=HNSW_EF_SEARCH)
+            self._search_params.referenced_objects = [selector]
+        return self._search_params
+    
+    def _search(self, query_embedding: np.ndarray, top_k: int) -> List[Dict]:
+        """Top-k stored chunks by cosine similarity to a unit-length (1, d) query embedding."""
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
+        k = min(top_k, len(self._matrix) - len(self._deleted))
+        if k <= 0:
             return []
         
-        query_embedding = self.model.encode([query])[0]
-        embeddings_array = np.array(self.vectors["embeddings"])
-        
-        # Compute cosine similarity
-        similarities = np.dot(embeddings_array, query_embedding) / (
-            np.linalg.norm(embeddings_array, axis=1) * np.linalg.norm(query_embedding)
-        )
-        
-        # Get top k
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
+        if len(self._matrix) <= EXACT_SEARCH_MAX_VECTORS:
+            # Exact cosine similarity: rows and query are unit length; promoted to float32 for BLAS
+            all_similarities = self._matrix.astype(np.float32) @ query_embedding[0]
+            if self._deleted:
+                all_similarities[list(self._deleted)] = -np.inf
+            # Select the top k in O(N), then sort only those k
+            indices = np.argpartition(-all_similarities, k - 1)[:k]
+            indices = indices[np.argsort(-all_similarities[indices])]
+            similarities = all_similarities[indices]
+        else:
+            # Approximate nearest neighbours by cosine similarity, best first
+            similarities, indices = self.index.search(query_embedding, k, params=self._get_search_params())
+            similarities, indices = similarities[0], indices[0]
         
         results = []
-        for idx in top_indices:
+        for similarity, idx in zip(similarities, indices):
+            if idx < 0:
+                continue
             results.append({
                 "text": self.vectors["texts"][idx],
-                "similarity": float(similarities[idx]),
+                "similarity": float(similarity),
                 "metadata": self.vectors["metadata"][idx]
             })
         
         return results
+
+
+# Singleton instance
+_profile_engine_instance = None
+
+def get_profile_engine() -> ProfileEngine:
+    """Get profile engine singleton instance."""
+    global _profile_engine_instance
+    if _profile_engine_instance is None:
+        _profile_engine_instance = ProfileEngine()
+    return _profile_engine_instance
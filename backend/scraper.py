@@ -4,14 +4,28 @@ Scrapes LinkedIn and Greenhouse for remote ML/technical roles.
 """
 
 import asyncio
+import os
 import re
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, Browser
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Callable, List, Dict, Optional, Tuple
+import httpx
+from playwright.async_api import Page, Browser
+from browser import get_browser, shutdown_playwright
+from event_loop import install_uvloop
 from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 from database import get_db
 import logging
 import sys
 
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; titles are then checked keyword by keyword
+    ahocorasick = None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -19,6 +33,96 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Browser pages a scraper keeps open for LinkedIn searches and job detail fetches
+SCRAPER_MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES", "4"))
+
+# LinkedIn job card patterns, most specific first; the union is used to watch cards load
+LINKEDIN_CARD_SELECTORS = (
+    'div.base-card',
+    'div.job-search-card',
+    'li.jobs-search-results__list-item',
+    'div[data-job-id]'
+)
+LINKEDIN_CARD_SELECTOR = ', '.join(LINKEDIN_CARD_SELECTORS)
+
+# Patterns for fields within a LinkedIn card, tried in order
+LINKEDIN_TITLE_SELECTORS = (
+    'h3.base-search-card__title',
+    'h3.job-search-card__title',
+    'a.job-card-list__title',
+    'span.sr-only'
+)
+LINKEDIN_COMPANY_SELECTORS = (
+    'h4.base-search-card__subtitle',
+    'h4.job-search-card__company-name',
+    'a.job-card-container__company-name',
+    'span.job-card-container__primary-description'
+)
+LINKEDIN_LOCATION_SELECTORS = (
+    'span.job-search-card__location',
+    'span.job-card-container__metadata-item',
+)
+COUNT_CARDS_JS = "(selector) => document.querySelectorAll(selector).length"
+
+# Greenhouse boards fetched at once
+GREENHOUSE_CONCURRENCY = int(os.getenv("GREENHOUSE_CONCURRENCY", "4"))
+
+# How long scraped pages are reused: job pages change rarely, search results hourly
+JOB_DETAILS_CACHE_TTL = 24 * 3600
+LINKEDIN_SEARCH_CACHE_TTL = 3600
+
+# Recent search_jobs results per (keywords, salary_range, max_jobs), most recently used last
+SEARCH_CACHE_SIZE = 32
+SEARCH_CACHE_TTL = 300.0
+_search_cache: OrderedDict = OrderedDict()
+
+# Amounts like "$100k", "150,000" in salary text
+SALARY_RE = re.compile(r'\$?(\d{1,3}(?:,?\d{3})*(?:k|K)?)')
+
+# Greenhouse board markup: job section classes, company slug in the board URL
+GREENHOUSE_SECTION_CLASS_RE = re.compile('opening|job')
+GREENHOUSE_COMPANY_RE = re.compile(r'for=([^&]+)')
+
+# Headers introducing a requirements section, tried in order of preference
+REQUIREMENT_HEADER_RES = tuple(
+    re.compile(keyword, re.IGNORECASE)
+    for keyword in ('requirements', 'qualifications', 'must have', 'you have', 'what you bring')
+)
+
+
+def _title_matcher(keyword_list: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Predicate telling whether a lowercase title contains any of the keywords."""
+    # An empty keyword matches every title; the substring test keeps that behaviour
+    if ahocorasick is None or not all(keyword_list):
+        return lambda title: any(kw in title for kw in keyword_list)
+    
+    # One pass over the title for all keywords, stopping at the first hit
+    automaton = ahocorasick.Automaton()
+    for kw in keyword_list:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return lambda title: next(automaton.iter(title), None) is not None
+
+
+def _first_text(node, selectors: Tuple[str, ...], winners: Dict[Tuple[str, ...], str]) -> Optional[str]:
+    """
+    Text of the first of selectors matching inside node, trying the one that matched last time first.
+    winners remembers the matching selector per selector list across calls.
+    """
+    winner = winners.get(selectors)
+    if winner is not None:
+        elem = node.css_first(winner)
+        if elem:
+            return elem.text(strip=True)
+    for sel in selectors:
+        if sel == winner:
+            continue
+        elem = node.css_first(sel)
+        if elem:
+            winners[selectors] = sel
+            return elem.text(strip=True)
+    return None
+
 
 class JobScraper:
     """Web scraper for job postings."""
@@ -27,37 +131,68 @@ class JobScraper:
         """Initialize scraper."""
         self.browser: Optional[Browser] = None
         self.context = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        # Reusable pages, opened on demand up to SCRAPER_MAX_PAGES (see acquire_page)
+        self._page_slots = asyncio.Semaphore(SCRAPER_MAX_PAGES)
+        self._idle_pages: List[Page] = []
         
     async def initialize(self):
-        """Start browser session."""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=True)
+        """Open a browser context on the shared process-wide browser, plus an HTTP client for static pages."""
+        self.browser = await get_browser(headless=True)
         self.context = await self.browser.new_context()
+        # Greenhouse embed boards are server-rendered, so plain keep-alive HTTP replaces a browser page
+        self.http_client = httpx.AsyncClient(
+            timeout=10,
+            follow_redirects=True,
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        )
         
     async def close(self):
-        """Close browser session."""
+        """Close this scraper's context and HTTP client; the shared browser stays up."""
         if self.context:
             await self.context.close()
-        if self.browser:
-            await self.browser.close()
+        self.context = None
+        if self.http_client:
+            await self.http_client.aclose()
+        self.http_client = None
+        # Pooled pages closed with the context
+        self._idle_pages = []
+    
+    @asynccontextmanager
+    async def acquire_page(self):
+        """Borrow a page from the pool, reusing an idle one or opening one if none is idle."""
+        # The slot is held for the whole borrow, so a discarded page frees it for the next waiter
+        async with self._page_slots:
+            page = self._idle_pages.pop() if self._idle_pages else await self.context.new_page()
+            try:
+                yield page
+            finally:
+                await self._release_page(page)
+    
+    async def _release_page(self, page: Page):
+        """Reset a page and return it to the pool, dropping broken pages."""
+        try:
+            await page.goto('about:blank')
+            self._idle_pages.append(page)
+        except Exception as e:
+            logger.warning(f"Discarding pooled page: {e}")
+            if not page.is_closed():
+                await page.close()
     
     def parse_salary(self, salary_text: str) -> tuple:
         """Extract min and max salary from text."""
-        if not salary_text:
+        # Most listings carry no figures at all; skip the regex when there is no digit to match
+        if not salary_text or not any(map(str.isdigit, salary_text)):
             return None, None
         
         # Look for patterns like "$100k-$150k" or "$100,000 - $150,000"
-        numbers = re.findall(r'\$?(\d{1,3}(?:,?\d{3})*(?:k|K)?)', salary_text)
+        numbers = SALARY_RE.findall(salary_text)
         
         salaries = []
         for num in numbers:
-            num = num.replace(',', '')
-            if 'k' in num.lower():
-                num = num.lower().replace('k', '000')
-            try:
-                salaries.append(int(num))
-            except:
-                continue
+            # Matches are digits, commas and an optional k, so this is always a plain integer
+            num = num.replace(',', '').lower().replace('k', '000')
+            salaries.append(int(num))
         
         if len(salaries) >= 2:
             return min(salaries), max(salaries)
@@ -71,130 +206,126 @@ class JobScraper:
         Scrape LinkedIn for jobs matching keywords.
         Enhanced with better selectors and error handling.
         """
+        # Reuse a recent scrape of the same search instead of driving the browser again
+        db = get_db()
+        cache_key = f"linkedin:{keywords}:{max_jobs}"
+        cached = db.get_cached_search(cache_key, LINKEDIN_SEARCH_CACHE_TTL)
+        if cached is not None:
+            logger.info(f"Using cached LinkedIn results for keywords: {keywords}")
+            return cached
+        
         jobs = []
         
         try:
-            page = await self.context.new_page()
-            
             # Search URL (remote jobs, worldwide)
             keywords_encoded = keywords.replace(' ', '%20')
             search_url = f"https://www.linkedin.com/jobs/search/?keywords={keywords_encoded}&location=Worldwide&f_WT=2"
             
-            logger.info(f"Scraping LinkedIn with keywords: {keywords}")
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            
-            # Wait for content to load
-            try:
-                await page.wait_for_selector('.jobs-search__results-list', timeout=10000)
-            except:
-                logger.warning("LinkedIn jobs list not found, trying alternative selectors")
-            
-            await page.wait_for_timeout(3000)
-            
-            # Scroll to load more jobs
-            for _ in range(3):
-                await page.evaluate('window.scrollBy(0, window.innerHeight)')
-                await page.wait_for_timeout(1000)
-            
-            # Get page content
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Find job cards with multiple selector patterns
-            job_cards = []
-            selectors = [
-                'div.base-card',
-                'div.job-search-card',
-                'li.jobs-search-results__list-item',
-                'div[data-job-id]'
-            ]
-            
-            for selector in selectors:
-                cards = soup.select(selector)
-                if cards:
-                    job_cards.extend(cards)
-                    break
-            
-            logger.info(f"Found {len(job_cards)} job cards on LinkedIn")
-            
-            for card in job_cards[:max_jobs]:
+            async with self.acquire_page() as page:
+                logger.info(f"Scraping LinkedIn with keywords: {keywords}")
+                await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
+                
+                # Wait for content to load
                 try:
-                    # Try multiple selector patterns for title
-                    title = None
-                    title_selectors = [
-                        'h3.base-search-card__title',
-                        'h3.job-search-card__title',
-                        'a.job-card-list__title',
-                        'span.sr-only'
-                    ]
-                    for sel in title_selectors:
-                        elem = card.select_one(sel)
-                        if elem:
-                            title = elem.get_text(strip=True)
-                            break
-                    
-                    # Try multiple selector patterns for company
-                    company = None
-                    company_selectors = [
-                        'h4.base-search-card__subtitle',
-                        'h4.job-search-card__company-name',
-                        'a.job-card-container__company-name',
-                        'span.job-card-container__primary-description'
-                    ]
-                    for sel in company_selectors:
-                        elem = card.select_one(sel)
-                        if elem:
-                            company = elem.get_text(strip=True)
-                            break
-                    
-                    # Location
-                    location = "Remote"
-                    location_selectors = [
-                        'span.job-search-card__location',
-                        'span.job-card-container__metadata-item',
-                    ]
-                    for sel in location_selectors:
-                        elem = card.select_one(sel)
-                        if elem:
-                            location = elem.get_text(strip=True)
-                            break
-                    
-                    # Job URL
-                    url = None
-                    link_elem = card.find('a', href=True)
-                    if link_elem:
-                        url = link_elem.get('href', '')
-                        # Make absolute URL
-                        if url.startswith('/'):
-                            url = 'https://www.linkedin.com' + url
-                        # Clean URL
-                        if '?' in url:
-                            url = url.split('?')[0]
-                    
-                    if title and company and url:
-                        jobs.append({
-                            'title': title,
-                            'company': company,
-                            'location': location,
-                            'url': url,
-                            'source': 'LinkedIn',
-                            'description': '',
-                            'requirements': '',
-                            'salary_min': None,
-                            'salary_max': None
-                        })
-                        
-                        logger.info(f"Scraped: {title} at {company}")
+                    await page.wait_for_selector('.jobs-search__results-list', timeout=10000)
+                except:
+                    logger.warning("LinkedIn jobs list not found, trying alternative selectors")
                 
-                except Exception as e:
-                    logger.error(f"Error parsing LinkedIn job card: {e}")
-                    continue
-            
-            await page.close()
+                # Let late requests settle, for at most the 3s we used to sleep
+                try:
+                    await page.wait_for_load_state('networkidle', timeout=3000)
+                except Exception:
+                    pass
+                
+                # Scroll to load more jobs, moving on as soon as new cards render;
+                # stop once a scroll adds nothing within the old 1s pause
+                for _ in range(3):
+                    card_count = await page.evaluate(COUNT_CARDS_JS, LINKEDIN_CARD_SELECTOR)
+                    await page.evaluate('window.scrollBy(0, window.innerHeight)')
+                    try:
+                        await page.wait_for_function(
+                            f"([selector, count]) => ({COUNT_CARDS_JS})(selector) > count",
+                            arg=[LINKEDIN_CARD_SELECTOR, card_count],
+                            timeout=1000
+                        )
+                    except Exception:
+                        break
+                
+                # Get just the results list (the whole body if it never rendered) rather than
+                # the full document with its scripts, nav and footer
+                content = await page.evaluate(
+                    "(document.querySelector('.jobs-search__results-list') || document.body).outerHTML"
+                )
+            # Parse off the event loop so concurrent navigations and fetches keep running
+            jobs = await asyncio.to_thread(self._parse_linkedin_cards, content, max_jobs)
             
         except Exception as e:
             logger.error(f"LinkedIn scraping error: {e}")
         
+        # Empty results are usually a blocked or failed load; try again next time
+        if jobs:
+            db.cache_search(cache_key, jobs)
+        
+        return jobs
+    
+    def _parse_linkedin_cards(self, content: str, max_jobs: int) -> List[Dict]:
+        """Extract up to max_jobs jobs from LinkedIn results HTML."""
+        jobs = []
+        
+        # selectolax's C parser: card selection is the hot path on multi-MB result pages
+        tree = HTMLParser(content)
+        
+        # Find job cards with multiple selector patterns
+        job_cards = []
+        for selector in LINKEDIN_CARD_SELECTORS:
+            cards = tree.css(selector)
+            if cards:
+                job_cards.extend(cards)
+                break
+        
+        logger.info(f"Found {len(job_cards)} job cards on LinkedIn")
+        
+        # Cards on one page share markup: the selector that matched the last card is tried first
+        winning_selectors: Dict[Tuple[str, ...], str] = {}
+        
+        for card in job_cards[:max_jobs]:
+            try:
+                # Try multiple selector patterns for title, company and location
+                title = _first_text(card, LINKEDIN_TITLE_SELECTORS, winning_selectors)
+                company = _first_text(card, LINKEDIN_COMPANY_SELECTORS, winning_selectors)
+                location = _first_text(card, LINKEDIN_LOCATION_SELECTORS, winning_selectors) or "Remote"
+                
+                # Job URL
+                url = None
+                link_elem = card.css_first('a[href]')
+                if link_elem:
+                    url = link_elem.attributes.get('href') or ''
+                    # Make absolute URL
+                    if url.startswith('/'):
+                        url = 'https://www.linkedin.com' + url
+                    # Clean URL
+                    if '?' in url:
+                        url = url.split('?')[0]
+                
+                if title and company and url:
+                    jobs.append({
+                        'title': title,
+                        'company': company,
+                        'location': location,
+                        'url': url,
+                        'source': 'LinkedIn',
+                        'description': '',
+                        'requirements': '',
+                        'salary_min': None,
+                        'salary_max': None
+                    })
+                    
+                    logger.info(f"Scraped: {title} at {company}")
+            
+            except Exception as e:
+                logger.error(f"Error parsing LinkedIn job card: {e}")
+                continue
+        
         return jobs
     
     async def scrape_greenhouse(self, keywords: str, max_jobs: int = 25) -> List[Dict]:
@@ -202,8 +333,6 @@ class JobScraper:
         Scrape Greenhouse job boards.
         Enhanced with more company boards and better filtering.
         """
-        jobs = []
-        
         # Expanded list of tech company Greenhouse boards
         greenhouse_boards = [
             "https://boards.greenhouse.io/embed/job_board?for=openai",
@@ -216,88 +345,105 @@ class JobScraper:
             "https://boards.greenhouse.io/embed/job_board?for=adept",
         ]
         
-        try:
-            page = await self.context.new_page()
-            
-            for board_url in greenhouse_boards:
-                if len(jobs) >= max_jobs:
-                    break
-                    
-                try:
-                    logger.info(f"Scraping Greenhouse board: {board_url}")
-                    await page.goto(board_url, wait_until="domcontentloaded", timeout=30000)
-                    
-                    # Wait for job listings to load
-                    try:
-                        await page.wait_for_selector('.opening', timeout=5000)
-                    except:
-                        logger.warning(f"No jobs found on {board_url}")
-                        continue
-                    
-                    await page.wait_for_timeout(2000)
-                    
-                    content = await page.content()
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # Extract company name from URL
-                    company_match = re.search(r'for=([^&]+)', board_url)
-                    company = company_match.group(1).replace('-', ' ').title() if company_match else "Unknown"
-                    
-                    # Find job listings with multiple selector patterns
-                    job_sections = soup.find_all(['div', 'section'], class_=re.compile('opening|job'))
-                    
-                    for section in job_sections[:max_jobs]:
-                        try:
-                            # Find link and title
-                            link = section.find('a', href=re.compile('/jobs/'))
-                            if not link:
-                                continue
-                            
-                            title = link.get_text(strip=True)
-                            url = link.get('href', '')
-                            
-                            # Make full URL if relative
-                            if url.startswith('/'):
-                                base_url = 'https://boards.greenhouse.io'
-                                url = base_url + url
-                            
-                            # Find location if available
-                            location = "Remote"
-                            location_elem = section.find(['span', 'div'], class_=re.compile('location'))
-                            if location_elem:
-                                location = location_elem.get_text(strip=True)
-                            
-                            # Filter by keywords (case insensitive, partial match)
-                            keyword_list = [kw.strip().lower() for kw in keywords.split(',')]
-                            title_lower = title.lower()
-                            
-                            if any(kw in title_lower for kw in keyword_list):
-                                jobs.append({
-                                    'title': title,
-                                    'company': company,
-                                    'location': location,
-                                    'url': url,
-                                    'source': 'Greenhouse',
-                                    'description': '',
-                                    'requirements': '',
-                                    'salary_min': None,
-                                    'salary_max': None
-                                })
-                                
-                                logger.info(f"Scraped: {title} at {company}")
-                        
-                        except Exception as e:
-                            logger.error(f"Error parsing Greenhouse job: {e}")
-                            continue
-                
-                except Exception as e:
-                    logger.error(f"Error scraping Greenhouse board {board_url}: {e}")
+        # Title filter (case insensitive, partial match), shared by every board
+        matches_title = _title_matcher(tuple(kw.strip().lower() for kw in keywords.split(',')))
+        
+        # Boards are fetched concurrently, a few at a time
+        semaphore = asyncio.Semaphore(GREENHOUSE_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._scrape_greenhouse_board(board_url, matches_title, max_jobs, semaphore) for board_url in greenhouse_boards),
+            return_exceptions=True
+        )
+        
+        # Flatten in board order, so the cap keeps the same boards' jobs as a sequential scan
+        jobs = []
+        for board_url, result in zip(greenhouse_boards, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error scraping Greenhouse board {board_url}: {result}")
+                continue
+            jobs.extend(result)
+        
+        return jobs[:max_jobs]
+    
+    async def _scrape_greenhouse_board(self, board_url: str, matches_title: Callable[[str], bool], max_jobs: int,
+                                       semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Scrape one Greenhouse board for jobs whose lowercased title passes matches_title."""
+        async with semaphore:
+            logger.info(f"Scraping Greenhouse board: {board_url}")
+            response = await self.http_client.get(board_url)
+            response.raise_for_status()
+            content = response.text
+        
+        # Parse off the event loop so other boards' responses keep flowing
+        return await asyncio.to_thread(self._parse_greenhouse_board, content, board_url, matches_title, max_jobs)
+    
+    def _parse_greenhouse_board(self, content: str, board_url: str, matches_title: Callable[[str], bool],
+                                max_jobs: int) -> List[Dict]:
+        """Extract jobs whose lowercased title passes matches_title from a Greenhouse board's HTML."""
+        jobs = []
+        
+        tree = HTMLParser(content)
+        if not tree.css_first('.opening'):
+            logger.warning(f"No jobs found on {board_url}")
+            return jobs
+        
+        # Extract company name from URL
+        company_match = GREENHOUSE_COMPANY_RE.search(board_url)
+        company = company_match.group(1).replace('-', ' ').title() if company_match else "Unknown"
+        
+        # Find job listings with multiple selector patterns, in document order
+        job_sections = [
+            node for node in tree.css('[class]')
+            if node.tag in ('div', 'section') and GREENHOUSE_SECTION_CLASS_RE.search(node.attributes['class'] or '')
+        ]
+        
+        for section in job_sections[:max_jobs]:
+            try:
+                # Find link and title
+                link = section.css_first('a[href*="/jobs/"]')
+                if not link:
                     continue
+                
+                title = link.text(strip=True)
+                url = link.attributes.get('href') or ''
+                
+                # Make full URL if relative
+                if url.startswith('/'):
+                    base_url = 'https://boards.greenhouse.io'
+                    url = base_url + url
+                
+                # Find location if available
+                location = "Remote"
+                # css() also matches the section itself, which is not a candidate
+                location_elem = next(
+                    (
+                        elem for elem in section.css('[class*="location"]')
+                        if elem.tag in ('span', 'div') and elem.mem_id != section.mem_id
+                    ),
+                    None
+                )
+                if location_elem:
+                    location = location_elem.text(strip=True)
+                
+                # Filter by keywords (case insensitive, partial match)
+                if matches_title(title.lower()):
+                    jobs.append({
+                        'title': title,
+                        'company': company,
+                        'location': location,
+                        'url': url,
+                        'source': 'Greenhouse',
+                        'description': '',
+                        'requirements': '',
+                        'salary_min': None,
+                        'salary_max': None
+                    })
+                    
+                    logger.info(f"Scraped: {title} at {company}")
             
-            await page.close()
-            
-        except Exception as e:
-            logger.error(f"Greenhouse scraping error: {e}")
+            except Exception as e:
+                logger.error(f"Error parsing Greenhouse job: {e}")
+                continue
         
         return jobs
     
@@ -306,75 +452,128 @@ class JobScraper:
         Fetch detailed job description from URL.
         Enhanced with better content extraction.
         """
+        db = get_db()
+        cached = db.get_cached_job_details(url, JOB_DETAILS_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
         try:
-            page = await self.context.new_page()
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(2000)
-            
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Extract description with multiple selector patterns
-            description = ""
-            desc_selectors = [
-                'div.description',
-                'div.job-description',
-                'div[class*="description"]',
-                'div.content',
-                'section[class*="description"]',
-                'div#job-details',
-                'article'
-            ]
-            
-            for selector in desc_selectors:
-                elem = soup.select_one(selector)
-                if elem:
-                    description = elem.get_text(separator='\n', strip=True)
-                    break
-            
-            # Extract requirements section specifically
-            requirements = ""
-            req_keywords = ['requirements', 'qualifications', 'must have', 'you have', 'what you bring']
-            
-            for keyword in req_keywords:
-                # Find headers containing the keyword
-                headers = soup.find_all(['h2', 'h3', 'h4', 'strong', 'b'], string=re.compile(keyword, re.IGNORECASE))
-                if headers:
-                    # Get the content after the header
-                    for header in headers:
-                        next_elem = header.find_next(['ul', 'ol', 'div', 'p'])
-                        if next_elem:
-                            requirements += next_elem.get_text(separator='\n', strip=True) + '\n'
-                    if requirements:
-                        break
-            
-            await page.close()
+            async with self.acquire_page() as page:
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                # Client-rendered descriptions: wait for the network to go quiet, at most the old 2s sleep
+                try:
+                    await page.wait_for_load_state('networkidle', timeout=2000)
+                except Exception:
+                    pass
+                
+                content = await page.content()
             
-            return {
-                'description': description[:5000],  # Limit length
-                'requirements': requirements[:2000] if requirements else ""
-            }
+            # Parse off the event loop so concurrent detail fetches keep running
+            details = await asyncio.to_thread(self._parse_job_details, content)
+            if details['description'] or details['requirements']:
+                db.cache_job_details(url, details['description'], details['requirements'])
+            return details
             
         except Exception as e:
             logger.error(f"Error fetching job details from {url}: {e}")
             return {'description': '', 'requirements': ''}
     
+    def _parse_job_details(self, content: str) -> Dict:
+        """Extract the description and requirements from a job page's HTML."""
+        # lxml's C parser; BeautifulSoup stays for the find_next walk below
+        soup = BeautifulSoup(content, 'lxml')
+        
+        # Extract description with multiple selector patterns
+        description = ""
+        desc_selectors = [
+            'div.description',
+            'div.job-description',
+            'div[class*="description"]',
+            'div.content',
+            'section[class*="description"]',
+            'div#job-details',
+            'article'
+        ]
+        
+        for selector in desc_selectors:
+            elem = soup.select_one(selector)
+            if elem:
+                description = elem.get_text(separator='\n', strip=True)
+                break
+        
+        # Extract requirements section specifically
+        requirements = ""
+        for header_re in REQUIREMENT_HEADER_RES:
+            # Find headers containing the keyword
+            headers = soup.find_all(['h2', 'h3', 'h4', 'strong', 'b'], string=header_re)
+            if headers:
+                # Get the content after the header
+                for header in headers:
+                    next_elem = header.find_next(['ul', 'ol', 'div', 'p'])
+                    if next_elem:
+                        requirements += next_elem.get_text(separator='\n', strip=True) + '\n'
+                if requirements:
+                    break
+        
+        return {
+            'description': description[:5000],  # Limit length
+            'requirements': requirements[:2000] if requirements else ""
+        }
+    
+    async def get_job_details_many(self, urls: List[str], concurrency: int = SCRAPER_MAX_PAGES) -> List[Dict]:
+        """
+        Fetch details for several job URLs concurrently over the page pool.
+        Returns: one {description, requirements} dict per URL, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(url: str):
+            async with semaphore:
+                return await self.get_job_details(url)
+        
+        return await asyncio.gather(*map(fetch_one, urls))
+    
     async def search_jobs(self, keywords: str, salary_range: tuple = None, max_jobs: int = 50) -> List[Dict]:
         """
         Main search method combining all sources.
         Returns list of job dictionaries.
         """
-        await self.initialize()
+        # The same search repeated within SEARCH_CACHE_TTL returns the stored jobs without scraping
+        cache_key = (keywords, tuple(salary_range) if salary_range else None, max_jobs)
+        cached = _search_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            _search_cache.move_to_end(cache_key)
+            logger.info(f"Using cached search results for keywords: {keywords}")
+            return [dict(job) for job in cached[1]]
         
         all_jobs = []
         
-        # Scrape LinkedIn
-        linkedin_jobs = await self.scrape_linkedin(keywords, max_jobs=max_jobs//2)
-        all_jobs.extend(linkedin_jobs)
+        # Scrape LinkedIn and Greenhouse concurrently, each on its own page;
+        # one source failing still returns the other's jobs
+        await self.initialize()
+        try:
+            results = await asyncio.gather(
+                self.scrape_linkedin(keywords, max_jobs=max_jobs//2),
+                self.scrape_greenhouse(keywords, max_jobs=max_jobs//2),
+                return_exceptions=True
+            )
+        finally:
+            # Release the context and its pages even if the search is cancelled
+            await self.close()
+        for source, result in zip(("LinkedIn", "Greenhouse"), results):
+            if isinstance(result, BaseException):
+                logger.error(f"{source} scraping failed: {result}")
+                continue
+            all_jobs.extend(result)
         
-        # Scrape Greenhouse
-        greenhouse_jobs = await self.scrape_greenhouse(keywords, max_jobs=max_jobs//2)
-        all_jobs.extend(greenhouse_jobs)
+        # The same posting can show up under several selectors or boards; keep its first occurrence
+        seen_urls = set()
+        unique_jobs = []
+        for job in all_jobs:
+            if job['url'] not in seen_urls:
+                seen_urls.add(job['url'])
+                unique_jobs.append(job)
+        all_jobs = unique_jobs
         
         # Filter by salary if provided
         if salary_range:
@@ -392,26 +591,24 @@ class JobScraper:
         
         # Store in database
         db = get_db()
-        for job in all_jobs:
-            try:
-                job_id = db.insert_job(
-                    title=job['title'],
-                    company=job['company'],
-                    url=job['url'],
-                    source=job['source'],
-                    location=job.get('location'),
-                    salary_min=job.get('salary_min'),
-                    salary_max=job.get('salary_max'),
-                    description=job.get('description'),
-                    requirements=job.get('requirements')
-                )
-                job['id'] = job_id
-            except Exception as e:
-                logger.error(f"Error inserting job to DB: {e}")
-        
-        await self.close()
+        try:
+            job_ids = db.insert_jobs_many(all_jobs)
+        except Exception as e:
+            logger.error(f"Error inserting jobs to DB: {e}")
+            job_ids = [None] * len(all_jobs)
+        # Every returned job carries the same keys; fresh postings are not scored yet
+        for job, job_id in zip(all_jobs, job_ids):
+            job['id'] = job_id
+            job['fit_score'] = None
         
         logger.info(f"Total jobs scraped and stored: {len(all_jobs)}")
+        
+        # Empty results are usually failed scrapes; let the next call try again
+        if all_jobs:
+            _search_cache[cache_key] = (time.monotonic(), [dict(job) for job in all_jobs])
+            _search_cache.move_to_end(cache_key)
+            if len(_search_cache) > SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
         return all_jobs
 
 
@@ -422,7 +619,10 @@ async def main():
     print(f"\nScraped {len(jobs)} jobs:")
     for job in jobs:
         print(f"- {job['title']} at {job['company']} ({job['source']})")
+    
+    await shutdown_playwright()
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
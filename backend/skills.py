@@ -0,0 +1,126 @@
+"""
+ATS Submission Skills for AutoCareer.
+Submits applications straight to known ATS APIs over HTTP, skipping the browser.
+"""
+
+import os
+import re
+from typing import Dict, Optional, Callable, Awaitable
+import httpx
+import logging
+import sys
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+# Hosts whose job URLs look like /<board>/jobs/<id> or /<site>/<posting-id>
+GREENHOUSE_JOB_RE = re.compile(r'/([^/?#]+)/jobs/(\d+)')
+LEVER_POSTING_RE = re.compile(r'/([^/?#]+)/([0-9a-f-]{36})')
+
+
+def _split_name(name: str) -> tuple:
+    """Split a full name into (first, last)."""
+    parts = (name or '').split()
+    if not parts:
+        return '', ''
+    return parts[0], ' '.join(parts[1:])
+
+
+async def greenhouse_submit(job: Dict, profile: Dict, draft: Optional[Dict],
+                            dry_run: bool = True) -> Optional[Dict]:
+    """
+    Submit through the Greenhouse Job Board API.
+    Returns: result fields, or None when the skill cannot handle this job
+    """
+    api_key = os.getenv("GREENHOUSE_API_KEY")
+    match = GREENHOUSE_JOB_RE.search(job['url'])
+    if not api_key or not match:
+        return None
+
+    board_token, job_post_id = match.groups()
+    first_name, last_name = _split_name(profile.get('name'))
+    payload = {
+        'first_name': first_name,
+        'last_name': last_name,
+        'email': profile.get('email') or '',
+        'phone': profile.get('phone') or '',
+        'resume_text': profile.get('resume_text') or '',
+    }
+    if draft and draft.get('cover_letter'):
+        payload['cover_letter_text'] = draft['cover_letter']
+
+    fields_filled = {k: 'dry_run' if dry_run else True for k, v in payload.items() if v}
+    if dry_run:
+        logger.info(f"[DRY RUN] Would POST {len(fields_filled)} fields to Greenhouse board {board_token}")
+        return {'status': 'dry_run_complete', 'fields_filled': fields_filled,
+                'message': f"Dry run completed via Greenhouse API. {len(fields_filled)} fields mapped."}
+
+    url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs/{job_post_id}"
+    async with httpx.AsyncClient(timeout=30) as client:
+        response = await client.post(url, data=payload, auth=(api_key, ''))
+        response.raise_for_status()
+
+    return {'status': 'submitted', 'fields_filled': fields_filled,
+            'message': 'Application submitted via Greenhouse API'}
+
+
+async def lever_submit(job: Dict, profile: Dict, draft: Optional[Dict],
+                       dry_run: bool = True) -> Optional[Dict]:
+    """
+    Submit through the Lever Postings API.
+    Returns: result fields, or None when the skill cannot handle this job
+    """
+    api_key = os.getenv("LEVER_API_KEY")
+    match = LEVER_POSTING_RE.search(job['url'])
+    if not api_key or not match:
+        return None
+
+    site, posting_id = match.groups()
+    payload = {
+        'name': profile.get('name') or '',
+        'email': profile.get('email') or '',
+        'phone': profile.get('phone') or '',
+    }
+    urls = {}
+    links = profile.get('links') or {}
+    linkedin_url = links.get('linkedin')
+    github_url = links.get('github')
+    if linkedin_url:
+        urls['LinkedIn'] = linkedin_url
+    if github_url:
+        urls['GitHub'] = github_url
+    if urls:
+        payload['urls'] = urls
+    if draft and draft.get('cover_letter'):
+        payload['comments'] = draft['cover_letter']
+
+    fields_filled = {k: 'dry_run' if dry_run else True for k, v in payload.items() if v}
+    if dry_run:
+        logger.info(f"[DRY RUN] Would POST {len(fields_filled)} fields to Lever site {site}")
+        return {'status': 'dry_run_complete', 'fields_filled': fields_filled,
+                'message': f"Dry run completed via Lever API. {len(fields_filled)} fields mapped."}
+
+    url = f"https://api.lever.co/v0/postings/{site}/{posting_id}"
+    async with httpx.AsyncClient(timeout=30) as client:
+        response = await client.post(url, params={'key': api_key}, json=payload)
+        response.raise_for_status()
+
+    return {'status': 'submitted', 'fields_filled': fields_filled,
+            'message': 'Application submitted via Lever API'}
+
+
+# Registry of HTTP submission skills keyed by job URL host
+SKILLS: Dict[str, Callable[..., Awaitable[Optional[Dict]]]] = {
+    'boards.greenhouse.io': greenhouse_submit,
+    'job-boards.greenhouse.io': greenhouse_submit,
+    'jobs.lever.co': lever_submit,
+}
+
+
+def get_skill(host: str) -> Optional[Callable[..., Awaitable[Optional[Dict]]]]:
+    """Look up the submission skill for a URL host."""
+    return SKILLS.get((host or '').lower())
@@ -4,6 +4,7 @@ Debug script to reproduce and test the 'Analyze Fit' functionality.
 Tests the analyze_job endpoint with various scenarios.
 """
 
+import asyncio
 import sys
 import json
 import requests
@@ -13,6 +14,10 @@ import time
 sys.path.insert(0, '/root/jobApplicationAutoFiller/backend')
 
 from database import get_db
+from event_loop import install_uvloop
+
+# One keep-alive connection to the local API for all probes
+_SESSION = requests.Session()
 
 def test_direct_engine():
     """Test the IntelligenceEngine directly without API."""
@@ -48,7 +53,7 @@ def test_direct_engine():
         
         # Test analysis
         print(f"\n[1.2] Analyzing job {job['id']}...")
-        result = engine.analyze_job(job['id'], profile['id'])
+        result = asyncio.run(engine.analyze_job(job['id'], profile['id']))
         
         print(f"\n✅ Analysis Result:")
         print(f"   Job: {result['title']}")
@@ -85,7 +90,7 @@ def test_api_endpoint():
         
         # Check if server is running
         try:
-            response = requests.get("http://localhost:8000/", timeout=2)
+            response = _SESSION.get("http://localhost:8000/", timeout=2)
             print("✓ Backend server is already running")
         except:
             print("[2.1] Starting backend server...")
@@ -103,7 +108,7 @@ def test_api_endpoint():
             
             # Verify it started
             try:
-                response = requests.get("http://localhost:8000/", timeout=2)
+                response = _SESSION.get("http://localhost:8000/", timeout=2)
                 print("✓ Backend server started successfully")
             except:
                 print("❌ ERROR: Could not start backend server")
@@ -129,7 +134,7 @@ def test_api_endpoint():
         print(f"   POST {url}")
         print(f"   Payload: {payload}")
         
-        response = requests.post(url, json=payload, timeout=10)
+        response = _SESSION.post(url, json=payload, timeout=10)
         
         print(f"\n[2.3] Response Status: {response.status_code}")
         
@@ -174,7 +179,7 @@ def test_with_missing_data():
         
         print("\n[3.1] Testing with non-existent job_id...")
         try:
-            result = engine.analyze_job(99999, 1)
+            result = asyncio.run(engine.analyze_job(99999, 1))
             print("❌ ERROR: Should have raised ValueError for missing job")
             return False
         except ValueError as e:
@@ -185,7 +190,7 @@ def test_with_missing_data():
         jobs = db.get_jobs(limit=1)
         if jobs:
             try:
-                result = engine.analyze_job(jobs[0]['id'], 99999)
+                result = asyncio.run(engine.analyze_job(jobs[0]['id'], 99999))
                 print("❌ ERROR: Should have raised ValueError for missing profile")
                 return False
             except ValueError as e:
@@ -237,4 +242,5 @@ def main():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     sys.exit(main())